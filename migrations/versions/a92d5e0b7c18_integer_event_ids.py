@@ -0,0 +1,167 @@
+"""integer surrogate keys for events
+
+Revision ID: a92d5e0b7c18
+Revises: f4a7c2e91b36
+Create Date: 2026-10-19 16:48:22.530164
+
+Event ids were `phone + "-" + title.lower()` strings copied into every
+members.event_id. Events get an integer id and keep the old string as the
+unique natural_key; members and the archive tables are rewritten to point
+at the integer ids. Tables are rebuilt and copied rather than altered in
+place so the same script works on PostgreSQL and SQLite.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a92d5e0b7c18'
+down_revision: Union[str, Sequence[str], None] = 'f4a7c2e91b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EVENT_FIELDS = ['title', 'amount', 'style', 'scheduler_interval', 'start_time', 'admin_id']
+
+
+def _event_columns(id_type, natural_key: bool, archive: bool):
+    autoincrement = not archive and isinstance(id_type, sa.Integer)
+    cols = [sa.Column('id', id_type, primary_key=True, autoincrement=autoincrement)]
+    if natural_key:
+        cols.append(sa.Column('natural_key', sa.String(), nullable=False, unique=not archive))
+    cols += [
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('amount', sa.Float(), nullable=True),
+        sa.Column('style', sa.String(), nullable=True),
+        sa.Column('scheduler_interval', sa.Float(), nullable=True),
+        sa.Column('start_time', sa.DateTime(), nullable=True),
+        sa.Column('admin_id', sa.Integer(), sa.ForeignKey('admins.id'), nullable=False),
+    ]
+    if archive:
+        cols.append(sa.Column('archived_at', sa.DateTime(), nullable=True))
+    return cols
+
+
+def _member_columns(event_id_type, events_table: str, archive: bool):
+    return [
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=not archive),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('paid', sa.Boolean(), nullable=True),
+        sa.Column('event_id', event_id_type, sa.ForeignKey(f'{events_table}.id'), nullable=True),
+    ]
+
+
+def _copy_rows(bind, table: str, columns):
+    # Typed datetimes so values round-trip on SQLite, which stores them as text
+    src = sa.table(table, *[sa.column(c, sa.DateTime()) if c in ('start_time', 'archived_at') else sa.column(c) for c in columns])
+    return [dict(r._mapping) for r in bind.execute(sa.select(src))]
+
+
+def _swap_tables(new_to_old):
+    for old in ['members_archive', 'members', 'events_archive', 'events']:
+        op.drop_table(old)
+    for new, old in new_to_old:
+        op.rename_table(new, old)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    events = _copy_rows(bind, 'events', ['id'] + EVENT_FIELDS)
+    archived_events = _copy_rows(bind, 'events_archive', ['id'] + EVENT_FIELDS + ['archived_at'])
+    members = _copy_rows(bind, 'members', ['id', 'name', 'phone', 'paid', 'event_id'])
+    archived_members = _copy_rows(bind, 'members_archive', ['id', 'name', 'phone', 'paid', 'event_id'])
+
+    # Live and archived events share one id space (archival keeps the id)
+    new_ids = {}
+    for i, ev in enumerate(sorted(events, key=lambda e: (e['start_time'] is None, e['start_time'], e['id'])), start=1):
+        new_ids[('events', ev['id'])] = i
+    for j, ev in enumerate(sorted(archived_events, key=lambda e: e['id']), start=len(events) + 1):
+        new_ids[('events_archive', ev['id'])] = j
+
+    events_new = op.create_table('events_new', *_event_columns(sa.Integer(), True, False), sqlite_autoincrement=True)
+    events_archive_new = op.create_table('events_archive_new', *_event_columns(sa.Integer(), True, True))
+    members_new = op.create_table('members_new', *_member_columns(sa.Integer(), 'events_new', False))
+    members_archive_new = op.create_table('members_archive_new', *_member_columns(sa.Integer(), 'events_archive_new', True))
+
+    op.bulk_insert(events_new, [
+        {**{k: ev[k] for k in EVENT_FIELDS}, 'id': new_ids[('events', ev['id'])], 'natural_key': ev['id']}
+        for ev in events
+    ])
+    op.bulk_insert(events_archive_new, [
+        {**{k: ev[k] for k in EVENT_FIELDS + ['archived_at']}, 'id': new_ids[('events_archive', ev['id'])], 'natural_key': ev['id']}
+        for ev in archived_events
+    ])
+    op.bulk_insert(members_new, [
+        {**m, 'event_id': new_ids.get(('events', m['event_id']))} for m in members
+    ])
+    op.bulk_insert(members_archive_new, [
+        {**m, 'event_id': new_ids.get(('events_archive', m['event_id']))} for m in archived_members
+    ])
+
+    _swap_tables([
+        ('events_new', 'events'),
+        ('events_archive_new', 'events_archive'),
+        ('members_new', 'members'),
+        ('members_archive_new', 'members_archive'),
+    ])
+    op.create_index(op.f('ix_members_event_id'), 'members', ['event_id'], unique=False)
+    op.create_index(op.f('ix_members_archive_phone'), 'members_archive', ['phone'], unique=False)
+    op.create_index(op.f('ix_members_archive_event_id'), 'members_archive', ['event_id'], unique=False)
+
+    next_id = len(events) + len(archived_events)
+    if bind.dialect.name == 'postgresql':
+        op.execute(f"SELECT setval(pg_get_serial_sequence('events', 'id'), {max(next_id, 1)}, {'true' if next_id else 'false'})")
+        op.execute(f"SELECT setval(pg_get_serial_sequence('members', 'id'), (SELECT COALESCE(MAX(id), 0) + 1 FROM members), false)")
+    elif bind.dialect.name == 'sqlite' and next_id:
+        op.execute("DELETE FROM sqlite_sequence WHERE name = 'events'")
+        op.execute(f"INSERT INTO sqlite_sequence (name, seq) VALUES ('events', {next_id})")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+
+    events = _copy_rows(bind, 'events', ['id', 'natural_key'] + EVENT_FIELDS)
+    archived_events = _copy_rows(bind, 'events_archive', ['id', 'natural_key'] + EVENT_FIELDS + ['archived_at'])
+    members = _copy_rows(bind, 'members', ['id', 'name', 'phone', 'paid', 'event_id'])
+    archived_members = _copy_rows(bind, 'members_archive', ['id', 'name', 'phone', 'paid', 'event_id'])
+    live_keys = {ev['id']: ev['natural_key'] for ev in events}
+    archive_keys = {ev['id']: ev['natural_key'] for ev in archived_events}
+
+    events_old = op.create_table('events_old', *_event_columns(sa.String(), False, False))
+    events_archive_old = op.create_table('events_archive_old', *_event_columns(sa.String(), False, True))
+    members_old = op.create_table('members_old', *_member_columns(sa.String(), 'events_old', False))
+    members_archive_old = op.create_table('members_archive_old', *_member_columns(sa.String(), 'events_archive_old', True))
+
+    op.bulk_insert(events_old, [{**{k: ev[k] for k in EVENT_FIELDS}, 'id': ev['natural_key']} for ev in events])
+    # A natural key may have been archived more than once; the string schema can only keep one
+    seen = set()
+    kept_archive = []
+    for ev in sorted(archived_events, key=lambda e: e['id'], reverse=True):
+        if ev['natural_key'] not in seen:
+            seen.add(ev['natural_key'])
+            kept_archive.append(ev)
+    kept_archive_ids = {ev['id'] for ev in kept_archive}
+    op.bulk_insert(events_archive_old, [
+        {**{k: ev[k] for k in EVENT_FIELDS + ['archived_at']}, 'id': ev['natural_key']} for ev in kept_archive
+    ])
+    op.bulk_insert(members_old, [{**m, 'event_id': live_keys.get(m['event_id'])} for m in members])
+    op.bulk_insert(members_archive_old, [
+        {**m, 'event_id': archive_keys[m['event_id']]} for m in archived_members if m['event_id'] in kept_archive_ids
+    ])
+
+    op.drop_index(op.f('ix_members_event_id'), table_name='members')
+    op.drop_index(op.f('ix_members_archive_event_id'), table_name='members_archive')
+    op.drop_index(op.f('ix_members_archive_phone'), table_name='members_archive')
+    _swap_tables([
+        ('events_old', 'events'),
+        ('events_archive_old', 'events_archive'),
+        ('members_old', 'members'),
+        ('members_archive_old', 'members_archive'),
+    ])
+    op.create_index(op.f('ix_members_archive_phone'), 'members_archive', ['phone'], unique=False)
+    op.create_index(op.f('ix_members_archive_event_id'), 'members_archive', ['event_id'], unique=False)
@@ -0,0 +1,59 @@
+"""never reuse member ids
+
+Revision ID: c3e5b7a9d140
+Revises: a92d5e0b7c18
+Create Date: 2026-10-19 18:21:47.309512
+
+Archival copies members.id into members_archive.id (a primary key), so a
+member id handed out again after its row was archived makes every later
+archival batch fail. members becomes AUTOINCREMENT on SQLite and the id
+counter is moved past the archived ids on both SQLite and PostgreSQL.
+Live members that already collide with an archived id are renumbered
+(nothing references members.id).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5b7a9d140'
+down_revision: Union[str, Sequence[str], None] = 'a92d5e0b7c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _max_member_id(bind) -> int:
+    return bind.execute(sa.text(
+        "SELECT MAX(id) FROM (SELECT id FROM members UNION ALL SELECT id FROM members_archive) AS ids"
+    )).scalar() or 0
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    colliding = bind.execute(sa.text(
+        "SELECT id FROM members WHERE id IN (SELECT id FROM members_archive) ORDER BY id"
+    )).scalars().all()
+    next_id = _max_member_id(bind)
+    for old_id in colliding:
+        next_id += 1
+        bind.execute(sa.text("UPDATE members SET id = :new WHERE id = :old"), {"new": next_id, "old": old_id})
+
+    if bind.dialect.name == 'sqlite':
+        with op.batch_alter_table('members', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+            pass
+        if next_id:
+            op.execute("DELETE FROM sqlite_sequence WHERE name = 'members'")
+            op.execute(f"INSERT INTO sqlite_sequence (name, seq) VALUES ('members', {next_id})")
+    elif bind.dialect.name == 'postgresql':
+        op.execute(f"SELECT setval(pg_get_serial_sequence('members', 'id'), {next_id + 1}, false)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('members', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+            pass
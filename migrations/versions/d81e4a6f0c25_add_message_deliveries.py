@@ -0,0 +1,40 @@
+"""add message_deliveries
+
+Revision ID: d81e4a6f0c25
+Revises: b3f1c9d2e7a4
+Create Date: 2026-10-19 11:03:47.218390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81e4a6f0c25'
+down_revision: Union[str, Sequence[str], None] = 'b3f1c9d2e7a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('message_deliveries',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('message_sid', sa.String(), nullable=False),
+    sa.Column('to_phone', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('error_code', sa.String(), nullable=True),
+    sa.Column('received_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_message_deliveries_to_phone'), 'message_deliveries', ['to_phone'], unique=False)
+    op.create_index(op.f('ix_message_deliveries_received_at'), 'message_deliveries', ['received_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_message_deliveries_received_at'), table_name='message_deliveries')
+    op.drop_index(op.f('ix_message_deliveries_to_phone'), table_name='message_deliveries')
+    op.drop_table('message_deliveries')
@@ -0,0 +1,53 @@
+"""add events_archive and members_archive
+
+Revision ID: f4a7c2e91b36
+Revises: d81e4a6f0c25
+Create Date: 2026-10-19 14:25:09.771845
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a7c2e91b36'
+down_revision: Union[str, Sequence[str], None] = 'd81e4a6f0c25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('events_archive',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('amount', sa.Float(), nullable=True),
+    sa.Column('style', sa.String(), nullable=True),
+    sa.Column('scheduler_interval', sa.Float(), nullable=True),
+    sa.Column('start_time', sa.DateTime(), nullable=True),
+    sa.Column('admin_id', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['admin_id'], ['admins.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('members_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('phone', sa.String(), nullable=True),
+    sa.Column('paid', sa.Boolean(), nullable=True),
+    sa.Column('event_id', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events_archive.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_members_archive_phone'), 'members_archive', ['phone'], unique=False)
+    op.create_index(op.f('ix_members_archive_event_id'), 'members_archive', ['event_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_members_archive_event_id'), table_name='members_archive')
+    op.drop_index(op.f('ix_members_archive_phone'), table_name='members_archive')
+    op.drop_table('members_archive')
+    op.drop_table('events_archive')
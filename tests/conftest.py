@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def migrated_sqlite(tmp_path):
+    """Factory: `migrated_sqlite("name")` returns the URL of a fresh SQLite file at `alembic upgrade head`."""
+
+    def make(name: str) -> str:
+        url = f"sqlite:///{tmp_path / (name + '.db')}"
+        env = {**os.environ, "DATABASE_URL": url}
+        env.pop("DATABASE_REPLICA_URL", None)
+        subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=REPO_ROOT, env=env, check=True, capture_output=True)
+        return url
+
+    return make
+
+
+@pytest.fixture
+def fresh_engines(monkeypatch):
+    """Drop the lazily created engines and read-your-writes history so env changes take effect."""
+    from whatsapp_payment_reminder.db import database
+    for name in ("_engine", "_SessionLocal", "_replica_engine", "_ReadSessionLocal"):
+        monkeypatch.setattr(database, name, None)
+    monkeypatch.setattr(database, "_last_write_at", {})
+    yield database
+    for engine in (database._engine, database._replica_engine):
+        if engine is not None:
+            engine.dispose()
+
+
+@pytest.fixture
+def migrated_db(monkeypatch, fresh_engines, migrated_sqlite):
+    """Fresh SQLite database at `alembic upgrade head`, wired into the lazy engine."""
+    url = migrated_sqlite("app")
+    monkeypatch.setenv("DATABASE_URL", url)
+    monkeypatch.delenv("DATABASE_REPLICA_URL", raising=False)
+    yield url
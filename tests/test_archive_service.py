@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+
+def _old_event(title: str, age: timedelta = timedelta(days=365)):
+    from whatsapp_payment_reminder.services import db_service
+    start = datetime.utcnow() - age
+    event = db_service.create_event(
+        from_number="whatsapp:+972500000000", title=title, amount=10.0, style="equal",
+        frequency_minutes=60, start_time=start,
+    )
+    db_service.add_members_to_event(event.id, [{"name": "Dana", "phone": "+972511111111"}])
+    return event.id
+
+
+def test_archival_does_not_reuse_member_ids(migrated_db):
+    from whatsapp_payment_reminder.services import db_service
+    from whatsapp_payment_reminder.services.archive_service import run_archival
+
+    _old_event("first")
+    assert run_archival() == 1
+
+    # The archived member had the highest id; a reused id would collide in members_archive
+    _old_event("second")
+    assert run_archival() == 1
+    assert len(db_service.get_archived_events()) == 2
+
+
+def test_archival_rechecks_events_under_lock(migrated_db):
+    from whatsapp_payment_reminder.services import db_service
+
+    event_id = _old_event("paid up", age=timedelta(days=2))
+    db_service.set_member_paid("+972511111111", event_id)
+    now = datetime.utcnow()
+    cutoffs = {"expired_before": now - timedelta(days=90), "paid_before": now - timedelta(hours=24)}
+    assert db_service.get_archivable_event_ids(limit=10, **cutoffs) == [event_id]
+
+    # A new unpaid member between picking and moving keeps the event live
+    db_service.add_members_to_event(event_id, [{"name": "Noa", "phone": "+972522222222"}])
+    assert db_service.archive_events([event_id], **cutoffs) == 0
+    assert db_service.count_event_members(event_id) == 2
+    assert db_service.get_archived_events() == []
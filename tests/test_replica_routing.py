@@ -0,0 +1,67 @@
+import pytest
+
+
+@pytest.fixture
+def primary_and_replica(monkeypatch, fresh_engines, migrated_sqlite):
+    """Two migrated SQLite files standing in for the primary and an (unreplicated) replica."""
+    primary, replica = migrated_sqlite("primary"), migrated_sqlite("replica")
+    monkeypatch.setenv("DATABASE_URL", primary)
+    monkeypatch.setenv("DATABASE_REPLICA_URL", replica)
+    monkeypatch.setattr(fresh_engines, "REPLICA_STICKY_SECONDS", 30)
+
+
+def _create_event(title: str):
+    from datetime import datetime
+    from whatsapp_payment_reminder.services import db_service
+    return db_service.create_event(
+        from_number="whatsapp:+972500000000", title=title, amount=10.0, style="equal",
+        frequency_minutes=60, start_time=datetime.utcnow(),
+    )
+
+
+def _visible_titles():
+    from whatsapp_payment_reminder.services import db_service
+    return [e.title for e in db_service.get_all_events()]
+
+
+def test_reads_go_to_replica_by_default(primary_and_replica):
+    _create_event("on primary")
+    # Nothing replicates between the two files, so a replica read can't see the write
+    assert _visible_titles() == []
+
+
+def test_commit_pins_rest_of_block_to_primary(primary_and_replica):
+    from whatsapp_payment_reminder.db.database import read_your_writes
+
+    with read_your_writes("whatsapp:+972511111111"):
+        assert _visible_titles() == []
+        _create_event("mine")
+        assert _visible_titles() == ["mine"]
+
+
+def test_same_key_stays_pinned_within_sticky_window(primary_and_replica):
+    from whatsapp_payment_reminder.db.database import read_your_writes
+
+    with read_your_writes("whatsapp:+972511111111"):
+        _create_event("mine")
+    with read_your_writes("whatsapp:+972511111111"):
+        assert _visible_titles() == ["mine"]
+
+
+def test_other_key_is_not_pinned(primary_and_replica):
+    from whatsapp_payment_reminder.db.database import read_your_writes
+
+    with read_your_writes("whatsapp:+972511111111"):
+        _create_event("mine")
+    with read_your_writes("whatsapp:+972522222222"):
+        assert _visible_titles() == []
+
+
+def test_pin_expires_after_sticky_window(primary_and_replica, monkeypatch):
+    from whatsapp_payment_reminder.db import database
+
+    with database.read_your_writes("whatsapp:+972511111111"):
+        _create_event("mine")
+    monkeypatch.setattr(database, "REPLICA_STICKY_SECONDS", 0)
+    with database.read_your_writes("whatsapp:+972511111111"):
+        assert _visible_titles() == []
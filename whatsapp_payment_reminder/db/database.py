@@ -1,11 +1,28 @@
 import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 
 Base = declarative_base()
 
 _engine = None
 _SessionLocal = None
+_replica_engine = None
+_ReadSessionLocal = None
+
+# Read-your-writes: after a caller commits on the primary, its reads stay on the primary
+# for REPLICA_STICKY_SECONDS so replica lag can't hide what it just wrote.
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "30"))
+_last_write_at: Dict[str, float] = {}
+_writer_key: ContextVar[Optional[str]] = ContextVar("writer_key", default=None)
+_force_primary: ContextVar[bool] = ContextVar("force_primary", default=False)
+
+
+def _echo() -> bool:
+    return os.getenv("SQL_ECHO", "").lower() in ("1", "true", "yes")
 
 
 def get_engine():
@@ -14,7 +31,7 @@ def get_engine():
         db_url = os.getenv("DATABASE_URL")
         if not db_url:
             raise RuntimeError("DATABASE_URL is not set")
-        _engine = create_engine(db_url, echo=True)
+        _engine = create_engine(db_url, echo=_echo())
     return _engine
 
 
@@ -22,4 +39,53 @@ def get_session_local():
     global _SessionLocal
     if _SessionLocal is None:
         _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+        event.listen(_SessionLocal, "after_commit", _record_write)
     return _SessionLocal
+
+
+def get_replica_engine():
+    """Engine for read-only queries; the primary engine unless DATABASE_REPLICA_URL is set."""
+    global _replica_engine
+    if _replica_engine is None:
+        replica_url = os.getenv("DATABASE_REPLICA_URL")
+        _replica_engine = create_engine(replica_url, echo=_echo()) if replica_url else get_engine()
+    return _replica_engine
+
+
+def get_read_session_local():
+    """Sessionmaker for read-only helpers: the replica, unless read-your-writes pins this caller to the primary."""
+    global _ReadSessionLocal
+    if _force_primary.get() or not os.getenv("DATABASE_REPLICA_URL"):
+        return get_session_local()
+    if _ReadSessionLocal is None:
+        _ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=get_replica_engine())
+    return _ReadSessionLocal
+
+
+@contextmanager
+def read_your_writes(key: str):
+    """Scope a unit of work (e.g. one webhook message) to the writer `key`.
+
+    Reads inside go to the primary if `key` committed within REPLICA_STICKY_SECONDS,
+    and any commit inside pins the rest of the block to the primary as well.
+    """
+    recent = time.monotonic() - _last_write_at.get(key, float("-inf")) < REPLICA_STICKY_SECONDS
+    key_token = _writer_key.set(key)
+    primary_token = _force_primary.set(recent)
+    try:
+        yield
+    finally:
+        _force_primary.reset(primary_token)
+        _writer_key.reset(key_token)
+
+
+def _record_write(session) -> None:
+    key = _writer_key.get()
+    if key is None:
+        return
+    _force_primary.set(True)
+    now = time.monotonic()
+    _last_write_at[key] = now
+    if len(_last_write_at) > 10000:
+        for stale in [k for k, at in _last_write_at.items() if now - at >= REPLICA_STICKY_SECONDS]:
+            del _last_write_at[stale]
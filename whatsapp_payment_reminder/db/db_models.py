@@ -13,7 +13,10 @@ class Admin(Base):
 
 class Event(Base):
     __tablename__ = "events"
-    id = Column(String, primary_key=True)
+    # AUTOINCREMENT on SQLite too: archived events keep their id, so ids must never be reused
+    __table_args__ = {"sqlite_autoincrement": True}
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    natural_key = Column(String, unique=True, nullable=False)  # admin phone + "-" + lowercased title
     title = Column(String)
     amount = Column(Float)
     style = Column(String)
@@ -25,10 +28,47 @@ class Event(Base):
 
 class Member(Base):
     __tablename__ = "members"
+    # Archival copies member ids into members_archive.id, so they must never be reused either
+    __table_args__ = {"sqlite_autoincrement": True}
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String)
     phone = Column(String)
     paid = Column(Boolean, default=False)
-    event_id = Column(String, ForeignKey("events.id"))
+    event_id = Column(Integer, ForeignKey("events.id"), index=True)
     event = relationship("Event", back_populates="members")
 
+class ProcessedMessage(Base):
+    __tablename__ = "processed_messages"
+    message_sid = Column(String, primary_key=True)
+    received_at = Column(DateTime, default=datetime.utcnow)
+
+class MessageDelivery(Base):
+    __tablename__ = "message_deliveries"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    message_sid = Column(String, nullable=False)
+    to_phone = Column(String, index=True)
+    status = Column(String)
+    error_code = Column(String, nullable=True)
+    received_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class ArchivedEvent(Base):
+    __tablename__ = "events_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    natural_key = Column(String, nullable=False)
+    title = Column(String)
+    amount = Column(Float)
+    style = Column(String)
+    scheduler_interval = Column(Float)
+    start_time = Column(DateTime)
+    admin_id = Column(Integer, ForeignKey("admins.id"), nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    members = relationship("ArchivedMember", back_populates="event")
+
+class ArchivedMember(Base):
+    __tablename__ = "members_archive"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    phone = Column(String, index=True)
+    paid = Column(Boolean)
+    event_id = Column(Integer, ForeignKey("events_archive.id"), index=True)
+    event = relationship("ArchivedEvent", back_populates="members")
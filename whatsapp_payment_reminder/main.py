@@ -1,23 +1,106 @@
-from fastapi import FastAPI
-from dotenv import load_dotenv
+import logging
+import os
+from contextlib import asynccontextmanager
 
-from whatsapp_payment_reminder.db.database import get_engine
-from whatsapp_payment_reminder.routes.api import api_router
-from whatsapp_payment_reminder.services.scheduler_service import ReminderScheduler
+from whatsapp_payment_reminder.utils.startup_timing import startup_timer
+
+with startup_timer.measure_import("fastapi"):
+    from fastapi import FastAPI
+with startup_timer.measure_import("dotenv"):
+    from dotenv import load_dotenv
 
 load_dotenv()
 
-from whatsapp_payment_reminder.db.db_models import Base
-from whatsapp_payment_reminder.routes.webhooks import webhook_router as webhooks_router
+from whatsapp_payment_reminder.utils.logging_config import setup_logging, shutdown_logging
+
+logger = logging.getLogger(__name__)
+
+# Heavy dependencies first, then our modules in dependency order, so each label
+# only pays for what it imports itself (anything already loaded is free).
+with startup_timer.measure_import("sqlalchemy"):
+    import sqlalchemy.orm  # noqa: F401
+with startup_timer.measure_import("apscheduler"):
+    import apscheduler.executors.pool  # noqa: F401
+    import apscheduler.schedulers.background  # noqa: F401
+with startup_timer.measure_import("db"):
+    from whatsapp_payment_reminder.db import db_models  # noqa: F401
+with startup_timer.measure_import("services.db_service"):
+    from whatsapp_payment_reminder.services import db_service  # noqa: F401
+with startup_timer.measure_import("services.whatsapp_utils"):
+    from whatsapp_payment_reminder.services import whatsapp_utils  # noqa: F401
+with startup_timer.measure_import("services.session_store"):
+    from whatsapp_payment_reminder.services import session_store  # noqa: F401
+with startup_timer.measure_import("services.delivery_service"):
+    from whatsapp_payment_reminder.services.delivery_service import delivery_buffer
+with startup_timer.measure_import("services.message_dedup"):
+    from whatsapp_payment_reminder.services.message_dedup import WEBHOOK_DEDUP_PRUNE_INTERVAL_MINUTES, message_deduplicator
+with startup_timer.measure_import("services.payment_digest"):
+    from whatsapp_payment_reminder.services.payment_digest import payment_digest
+with startup_timer.measure_import("services.events_service"):
+    from whatsapp_payment_reminder.services import events_service  # noqa: F401
+with startup_timer.measure_import("services.members_service"):
+    from whatsapp_payment_reminder.services import members_service  # noqa: F401
+with startup_timer.measure_import("utils.profiling"):
+    from whatsapp_payment_reminder.utils.profiling import PROFILE_SAMPLE_RATE, ProfilingMiddleware, profiling_enabled
+with startup_timer.measure_import("services.interaction_service"):
+    from whatsapp_payment_reminder.services import interaction_service  # noqa: F401
+with startup_timer.measure_import("services.archive_service"):
+    from whatsapp_payment_reminder.services.archive_service import ARCHIVE_INTERVAL_MINUTES, run_archival
+with startup_timer.measure_import("services.scheduler_service"):
+    from whatsapp_payment_reminder.services.scheduler_service import ReminderScheduler, parse_quiet_hours
+with startup_timer.measure_import("pydantic.v1"):
+    # FastAPI loads its pydantic.v1 compat layer lazily on the first route declaration
+    import pydantic.v1  # noqa: F401
+with startup_timer.measure_import("routes.api"):
+    from whatsapp_payment_reminder.routes.api import api_router
+with startup_timer.measure_import("routes.webhooks"):
+    from whatsapp_payment_reminder.routes.webhooks import webhook_router as webhooks_router
+with startup_timer.measure_import("routes.admin"):
+    from whatsapp_payment_reminder.routes.admin import admin_router
 
-engine = get_engine()
-Base.metadata.create_all(bind=engine)
+# Schema is managed by Alembic (`alembic upgrade head`); nothing touches the DB at import time.
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Started here rather than at import so importing the app spawns no threads;
+    # setup_logging's atexit hook still flushes if shutdown never runs.
+    setup_logging()
+    delivery_buffer.start()
+    payment_digest.start()
+    reminder_scheduler = ReminderScheduler(
+        interval_minutes=100,
+        dispatch_window_seconds=float(os.getenv("REMINDER_DISPATCH_WINDOW_SECONDS", "0")),
+        max_messages_per_second=float(os.getenv("REMINDER_MAX_MESSAGES_PER_SECOND", "0")),
+        quiet_hours=parse_quiet_hours(os.getenv("REMINDER_QUIET_HOURS", "")),
+    )
+    if ARCHIVE_INTERVAL_MINUTES > 0:
+        reminder_scheduler.add_interval_job(run_archival, ARCHIVE_INTERVAL_MINUTES, "archive_events")
+    if message_deduplicator.shared:
+        reminder_scheduler.add_interval_job(
+            message_deduplicator.prune_shared, WEBHOOK_DEDUP_PRUNE_INTERVAL_MINUTES, "prune_processed_messages"
+        )
+    reminder_scheduler.start()
+    app.state.reminder_scheduler = reminder_scheduler
+    if PROFILE_SAMPLE_RATE > 0 and not profiling_enabled():
+        logger.warning("PROFILE_SAMPLE_RATE is set without PROFILE_TOKEN; request profiling is disabled")
+    startup_timer.mark_ready()
+    logger.info("scheduler started", extra={"startup": startup_timer.report()})
+    try:
+        yield
+    finally:
+        reminder_scheduler.shutdown()
+        delivery_buffer.stop()
+        payment_digest.stop()
+        shutdown_logging()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(webhooks_router)
 app.include_router(api_router)
-
-reminder_scheduler = ReminderScheduler(interval_minutes=100)
+app.include_router(admin_router)
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
 
 
 @app.get("/health")
@@ -25,12 +108,6 @@ def health_check():
     return {"status": "ok", "version": "1.0.0"}
 
 
-@app.on_event("startup")
-def start_scheduler():
-    reminder_scheduler.start()
-    print("Scheduler started! It will run every minute to send reminders.")
-
-
-@app.on_event("shutdown")
-def shutdown_scheduler():
-    reminder_scheduler.shutdown()
+@app.get("/health/startup")
+def startup_report():
+    return startup_timer.report()
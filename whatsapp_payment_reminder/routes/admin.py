@@ -0,0 +1,37 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse, Response
+
+from whatsapp_payment_reminder.utils import profiling
+from whatsapp_payment_reminder.utils.profiling import profile_store
+
+admin_router = APIRouter(prefix="/admin")
+
+
+def _require_profile_token(token: Optional[str]) -> None:
+    # Profiles include session state, so they are only served to holders of PROFILE_TOKEN
+    if not profiling.PROFILE_TOKEN or token != profiling.PROFILE_TOKEN:
+        raise HTTPException(status_code=404)
+
+
+@admin_router.get("/profiles")
+def list_profiles(x_debug_profile: Optional[str] = Header(None)):
+    _require_profile_token(x_debug_profile)
+    return profile_store.summaries()
+
+
+@admin_router.get("/profiles/{profile_id}")
+def download_profile(profile_id: int, format: str = "text", x_debug_profile: Optional[str] = Header(None)):
+    """`format=text` returns a pstats report; `format=prof` the raw stats for pstats/snakeviz."""
+    _require_profile_token(x_debug_profile)
+    entry = profile_store.get(profile_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="profile not found")
+    if format == "prof":
+        return Response(
+            entry["stats"],
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="webhook-{profile_id}.prof"'},
+        )
+    return PlainTextResponse(profile_store.render_text(entry))
@@ -1,14 +1,13 @@
 from dotenv import load_dotenv
 from fastapi import APIRouter
 
-from whatsapp_payment_reminder.db.database import get_session_local
+from whatsapp_payment_reminder.db.database import get_read_session_local
 
 load_dotenv()
 
 from whatsapp_payment_reminder.db.db_models import Event
 from whatsapp_payment_reminder.services.events_service import send_event_reminders
-
-SessionLocal = get_session_local()
+from whatsapp_payment_reminder.services import db_service
 
 # =======================
 # 📡 Manual Trigger Endpoint
@@ -18,14 +17,14 @@ api_router = APIRouter()
 
 
 @api_router.post("/send_reminders/{event_id}")
-async def trigger_event_reminders(event_id: str):
+async def trigger_event_reminders(event_id: int):
     res = send_event_reminders(event_id)
     return res
 
 
 @api_router.get("/events")
 async def list_events():
-    db = SessionLocal()
+    db = get_read_session_local()()
     events = db.query(Event).all()
     events_list = []
     for e in events:
@@ -40,3 +39,21 @@ async def list_events():
         })
     db.close()
     return events_list
+
+
+@api_router.get("/events/archive")
+async def list_archived_events(limit: int = 100, offset: int = 0):
+    events = db_service.get_archived_events(limit=limit, offset=offset)
+    return [
+        {
+            "id": e.id,
+            "title": e.title,
+            "amount": e.amount,
+            "style": e.style,
+            "archived_at": e.archived_at,
+            "members": [
+                {"name": m.name, "phone": m.phone, "paid": m.paid} for m in e.members
+            ]
+        }
+        for e in events
+    ]
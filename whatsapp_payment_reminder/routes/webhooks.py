@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Request
 
+from whatsapp_payment_reminder.db.database import read_your_writes
+
 from whatsapp_payment_reminder.services.interaction_service import (
     handle_state,
     handle_name_step,
@@ -12,8 +14,11 @@ from whatsapp_payment_reminder.services.interaction_service import (
 )
 from whatsapp_payment_reminder.services.whatsapp_utils import send_whatsapp_message
 from whatsapp_payment_reminder.services.session_store import session_store
+from whatsapp_payment_reminder.services.message_dedup import message_deduplicator
+from whatsapp_payment_reminder.services.delivery_service import delivery_buffer
 from whatsapp_payment_reminder.services.events_service import handle_create_event
 from whatsapp_payment_reminder.services.members_service import handle_add_members, handle_mark_paid
+from whatsapp_payment_reminder.utils import profiling
 from whatsapp_payment_reminder.utils.templates import HELP_MSG
 
 webhook_router = APIRouter()
@@ -24,26 +29,80 @@ async def whatsapp_webhook(request: Request):
     data = await request.form()
     from_number = data.get("From", "")
     body = data.get("Body", "").strip()
+    message_sid = data.get("MessageSid", "")
+
+    # Twilio retries slow webhooks with the same MessageSid; answer those without reprocessing
+    if message_deduplicator.is_duplicate(message_sid):
+        return {"status": "duplicate"}
+
+    try:
+        with read_your_writes(from_number):
+            _handle_message(from_number, body)
+    except Exception:
+        message_deduplicator.forget(message_sid)
+        raise
+    return {"status": "ok"}
+
+
+@webhook_router.post("/status")
+async def delivery_status_callback(request: Request):
+    data = await request.form()
+    delivery_buffer.add(
+        message_sid=data.get("MessageSid", ""),
+        to=data.get("To", ""),
+        status=data.get("MessageStatus", ""),
+        error_code=data.get("ErrorCode"),
+    )
+    return {"status": "ok"}
+
+
+@webhook_router.get("/webhook/dedup_stats")
+def webhook_dedup_stats():
+    return message_deduplicator.stats()
+
+
+def _start_event_wizard(from_number: str, body: str) -> None:
+    session_store[from_number] = {"state": "CREATING_EVENT_NAME"}
+    send_whatsapp_message(from_number, "מה שם האירוע?")
+
 
+def _send_help(from_number: str, body: str) -> None:
+    send_whatsapp_message(from_number, HELP_MSG)
+
+
+def _show_user_events(from_number: str, body: str) -> None:
+    show_user_events(from_number)
+
+
+def _send_main_menu(from_number: str, body: str) -> None:
+    send_main_menu(from_number)
+
+
+# Main menu options
+_MENU_HANDLERS = {
+    "1": _start_event_wizard,
+    "2": _show_user_events,
+    "3": _send_help,
+}
+
+
+def _menu_handler(body: str):
+    if body in _MENU_HANDLERS:
+        return _MENU_HANDLERS[body]
+    if body.lower().startswith("create event:"):
+        return handle_create_event
+    if "paid" in body.lower():
+        return handle_mark_paid
+    return _send_main_menu
+
+
+def _handle_message(from_number: str, body: str) -> None:
     state = session_store.get(from_number, {"state": "IDLE"})
 
     # delegate non-IDLE state handling
     if handle_state(from_number, body, state):
-        return {"status": "ok"}
-
-    # Main menu options
-    if body == "1":
-        session_store[from_number] = {"state": "CREATING_EVENT_NAME"}
-        send_whatsapp_message(from_number, "מה שם האירוע?")
-        return {"status": "ok"}
-    elif body == "2":
-        show_user_events(from_number)
-    elif body == "3":
-        send_whatsapp_message(from_number, HELP_MSG)
-    elif body.lower().startswith("create event:"):
-        handle_create_event(from_number, body)
-    elif "paid" in body.lower():
-        handle_mark_paid(from_number, body)
-    else:
-        send_main_menu(from_number)
-    return {"status": "ok"}
+        return
+
+    handler = _menu_handler(body)
+    profiling.annotate(handler=handler.__name__)
+    handler(from_number, body)
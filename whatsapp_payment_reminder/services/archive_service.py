@@ -0,0 +1,40 @@
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from whatsapp_payment_reminder.services import db_service
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_INTERVAL_MINUTES = float(os.getenv("ARCHIVE_INTERVAL_MINUTES", "60"))  # 0 disables the job
+ARCHIVE_MAX_AGE_DAYS = float(os.getenv("ARCHIVE_MAX_AGE_DAYS", "90"))
+ARCHIVE_PAID_MIN_AGE_HOURS = float(os.getenv("ARCHIVE_PAID_MIN_AGE_HOURS", "24"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+
+
+def run_archival(now: Optional[datetime] = None, batch_size: int = ARCHIVE_BATCH_SIZE, max_batches: int = 100) -> int:
+    """Move fully paid and expired events (with their members) into the archive tables.
+
+    Fully paid events are archived once they are ARCHIVE_PAID_MIN_AGE_HOURS past
+    their start time; any event is archived ARCHIVE_MAX_AGE_DAYS after it.
+    Each batch is its own transaction so the hot tables are never locked for long.
+    Returns the number of events archived.
+    """
+    now = now or datetime.utcnow()
+    expired_before = now - timedelta(days=ARCHIVE_MAX_AGE_DAYS)
+    paid_before = now - timedelta(hours=ARCHIVE_PAID_MIN_AGE_HOURS)
+
+    archived = 0
+    for _ in range(max_batches):
+        event_ids = db_service.get_archivable_event_ids(
+            expired_before=expired_before,
+            paid_before=paid_before,
+            limit=batch_size,
+        )
+        if not event_ids:
+            break
+        archived += db_service.archive_events(event_ids, expired_before=expired_before, paid_before=paid_before)
+    if archived:
+        logger.info("archived events", extra={"events": archived})
+    return archived
@@ -1,16 +1,52 @@
-from whatsapp_payment_reminder.db.database import get_session_local
-from whatsapp_payment_reminder.db.db_models import Event, Member, Admin
+from whatsapp_payment_reminder.db.database import get_session_local, get_read_session_local
+from whatsapp_payment_reminder.db.db_models import (
+    Event,
+    Member,
+    Admin,
+    ProcessedMessage,
+    MessageDelivery,
+    ArchivedEvent,
+    ArchivedMember,
+)
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
-from typing import List
+from typing import List, NamedTuple, Optional, Set
+from sqlalchemy import case, delete, func, insert, literal, select
 from sqlalchemy.orm import joinedload
 
-SessionLocal = get_session_local()
+FAILED_STATUSES = ("failed", "undelivered")
+DELIVERED_STATUSES = ("delivered", "read")
+
+
+# Lightweight projections for hot read paths (scheduler, reminders, member listings).
+# Plain tuples: no identity map, no instance state, nothing to expunge.
+class EventRow(NamedTuple):
+    id: int
+    title: str
+    amount: float
+    style: str
+    scheduler_interval: float
+    start_time: datetime
+
+
+class MemberContact(NamedTuple):
+    name: str
+    phone: str
+
+
+class MemberEventSummary(NamedTuple):
+    title: str
+    amount: float
+    style: str
+    unpaid_count: int
+
+
+_EVENT_ROW_COLUMNS = (Event.id, Event.title, Event.amount, Event.style, Event.scheduler_interval, Event.start_time)
 
 
 def get_all_events():
     """Return list of all Event rows."""
-    db = SessionLocal()
+    db = get_read_session_local()()
     try:
         events = db.query(Event).all()
         # Detach objects before closing session
@@ -21,9 +57,9 @@ def get_all_events():
         db.close()
 
 
-def get_event(event_id: str):
+def get_event(event_id: int):
     """Return a single Event by id or None if not found."""
-    db = SessionLocal()
+    db = get_session_local()()
     try:
         event = db.query(Event).filter(Event.id == event_id).first()
         if event:
@@ -33,9 +69,9 @@ def get_event(event_id: str):
         db.close()
 
 
-def get_unpaid_members(event_id: str):
+def get_unpaid_members(event_id: int):
     """Return a list of unpaid Member rows for the given event."""
-    db = SessionLocal()
+    db = get_read_session_local()()
     try:
         unpaid_members = (
             db.query(Member)
@@ -50,6 +86,61 @@ def get_unpaid_members(event_id: str):
         db.close()
 
 
+def get_all_event_rows() -> List[EventRow]:
+    """Return an EventRow for every event (scheduler scan)."""
+    db = get_read_session_local()()
+    try:
+        return [EventRow(*r) for r in db.query(*_EVENT_ROW_COLUMNS).all()]
+    finally:
+        db.close()
+
+
+def get_event_row(event_id: int) -> Optional[EventRow]:
+    """Return the EventRow for `event_id` or None if not found."""
+    db = get_session_local()()
+    try:
+        row = db.query(*_EVENT_ROW_COLUMNS).filter(Event.id == event_id).first()
+        return EventRow(*row) if row else None
+    finally:
+        db.close()
+
+
+def get_unpaid_member_contacts(event_id: int) -> List[MemberContact]:
+    """Return (name, phone) for each unpaid member of the event."""
+    db = get_read_session_local()()
+    try:
+        rows = (
+            db.query(Member.name, Member.phone)
+            .filter(Member.event_id == event_id, Member.paid == False)
+            .all()
+        )
+        return [MemberContact(*r) for r in rows]
+    finally:
+        db.close()
+
+
+def get_member_event_summaries(phone: str) -> List[MemberEventSummary]:
+    """Return title/amount/style and unpaid count for every event the phone belongs to."""
+    db = get_read_session_local()()
+    try:
+        member_event_ids = db.query(Member.event_id).filter(Member.phone == phone)
+        rows = (
+            db.query(
+                Event.title,
+                Event.amount,
+                Event.style,
+                func.sum(case((Member.paid == False, 1), else_=0)),
+            )
+            .join(Member, Member.event_id == Event.id)
+            .filter(Event.id.in_(member_event_ids))
+            .group_by(Event.id, Event.title, Event.amount, Event.style)
+            .all()
+        )
+        return [MemberEventSummary(title, amount, style, int(unpaid or 0)) for title, amount, style, unpaid in rows]
+    finally:
+        db.close()
+
+
 def create_event(*, from_number: str, title: str, amount: float, style: str, frequency_minutes: int, start_time: datetime):
     """Create a new Event row and its Admin if needed.
 
@@ -60,9 +151,9 @@ def create_event(*, from_number: str, title: str, amount: float, style: str, fre
     Raises
     ------
     IntegrityError
-        If an event with the same id already exists.
+        If the admin already has an event with the same (case-insensitive) title.
     """
-    db = SessionLocal()
+    db = get_session_local()()
     try:
         admin_phone = from_number.replace("whatsapp:", "")
         admin = db.query(Admin).filter(Admin.phone == admin_phone).first()
@@ -72,10 +163,8 @@ def create_event(*, from_number: str, title: str, amount: float, style: str, fre
             db.commit()
             db.refresh(admin)
 
-        event_id = admin_phone + "-" + title.lower()
-
         new_event = Event(
-            id=event_id,
+            natural_key=admin_phone + "-" + title.lower(),
             title=title,
             amount=amount,
             style=style,
@@ -95,10 +184,10 @@ def create_event(*, from_number: str, title: str, amount: float, style: str, fre
         db.close()
 
 
-def add_members_to_event(event_id: str, members: List[dict]) -> int:
+def add_members_to_event(event_id: int, members: List[dict]) -> int:
     """Add a list of members to the given event_id.
     Returns the number of members added so far (total)."""
-    db = SessionLocal()
+    db = get_session_local()()
     try:
         for m in members:
             db_member = Member(name=m["name"], phone=m["phone"], paid=False, event_id=event_id)
@@ -110,16 +199,39 @@ def add_members_to_event(event_id: str, members: List[dict]) -> int:
         db.close()
 
 
-def count_event_members(event_id: str) -> int:
-    db = SessionLocal()
+def count_event_members(event_id: int) -> int:
+    db = get_session_local()()
     try:
         return db.query(Member).filter(Member.event_id == event_id).count()
     finally:
         db.close()
 
 
+def get_event_payment_stats(event_id: int):
+    """Return (paid_count, unpaid_count, amount) for the event, or None if it doesn't exist."""
+    db = get_session_local()()
+    try:
+        row = (
+            db.query(
+                Event.amount,
+                func.sum(case((Member.paid == True, 1), else_=0)),
+                func.sum(case((Member.paid == False, 1), else_=0)),
+            )
+            .outerjoin(Member, Member.event_id == Event.id)
+            .filter(Event.id == event_id)
+            .group_by(Event.id, Event.amount)
+            .first()
+        )
+        if not row:
+            return None
+        amount, paid, unpaid = row
+        return int(paid or 0), int(unpaid or 0), amount
+    finally:
+        db.close()
+
+
 def get_admin(admin_id: int):
-    db = SessionLocal()
+    db = get_session_local()()
     try:
         admin = db.query(Admin).filter(Admin.id == admin_id).first()
         if admin:
@@ -129,7 +241,7 @@ def get_admin(admin_id: int):
         db.close()
 
 
-def set_member_paid(phone: str, event_id: str):
+def set_member_paid(phone: str, event_id: int):
     """Mark member as paid and return lightweight info.
 
     Returns
@@ -138,7 +250,7 @@ def set_member_paid(phone: str, event_id: str):
         (member_name, member_phone, event_title, admin_id) on success
         None if the member was already marked as paid or not found.
     """
-    db = SessionLocal()
+    db = get_session_local()()
     try:
         member = db.query(Member).filter(Member.phone == phone, Member.event_id == event_id).first()
         if not member:
@@ -157,7 +269,7 @@ def set_member_paid(phone: str, event_id: str):
 
 def get_unpaid_members_by_phone(phone: str):
     """Return list of unpaid Member objects for this phone with event relationship eager-loaded."""
-    db = SessionLocal()
+    db = get_session_local()()
     try:
         members = (
             db.query(Member)
@@ -174,7 +286,7 @@ def get_unpaid_members_by_phone(phone: str):
 
 def get_events_for_member_phone(phone: str):
     """Return a detached list of Event objects that the given phone belongs to (members relationship pre-loaded)."""
-    db = SessionLocal()
+    db = get_read_session_local()()
     try:
         members = db.query(Member).filter(Member.phone == phone).all()
         if not members:
@@ -191,3 +303,167 @@ def get_events_for_member_phone(phone: str):
         return events
     finally:
         db.close()
+
+
+def record_processed_message(message_sid: str) -> bool:
+    """Record an inbound Twilio MessageSid.
+
+    Returns
+    -------
+    bool
+        True if this is the first time the sid is seen, False if another
+        delivery (or replica) already recorded it.
+    """
+    db = get_session_local()()
+    try:
+        db.add(ProcessedMessage(message_sid=message_sid))
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+
+def delete_processed_message(message_sid: str) -> None:
+    """Forget a MessageSid so a retried delivery is processed again."""
+    db = get_session_local()()
+    try:
+        db.query(ProcessedMessage).filter(ProcessedMessage.message_sid == message_sid).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def delete_processed_messages_before(cutoff: datetime) -> int:
+    """Delete MessageSids received before `cutoff`. Returns the number of rows deleted."""
+    db = get_session_local()()
+    try:
+        result = db.execute(delete(ProcessedMessage).where(ProcessedMessage.received_at < cutoff))
+        db.commit()
+        return result.rowcount
+    finally:
+        db.close()
+
+
+def insert_message_deliveries(rows: List[dict]) -> None:
+    """Bulk-insert delivery status rows (message_sid, to_phone, status, error_code, received_at)."""
+    if not rows:
+        return
+    db = get_session_local()()
+    try:
+        db.execute(insert(MessageDelivery), rows)
+        db.commit()
+    finally:
+        db.close()
+
+
+def get_failing_phones(since: datetime, min_failures: int) -> Set[str]:
+    """Return phones with at least `min_failures` failed deliveries and none delivered since `since`."""
+    failed = case((MessageDelivery.status.in_(FAILED_STATUSES), 1), else_=0)
+    delivered = case((MessageDelivery.status.in_(DELIVERED_STATUSES), 1), else_=0)
+    db = get_session_local()()
+    try:
+        rows = (
+            db.query(MessageDelivery.to_phone)
+            .filter(MessageDelivery.received_at >= since)
+            .group_by(MessageDelivery.to_phone)
+            .having(func.sum(failed) >= min_failures)
+            .having(func.sum(delivered) == 0)
+            .all()
+        )
+        return {phone for (phone,) in rows}
+    finally:
+        db.close()
+
+
+def _archivable(expired_before: datetime, paid_before: datetime):
+    """Filter for events that started before `expired_before`, or before `paid_before` with all members paid."""
+    has_members = select(Member.id).where(Member.event_id == Event.id).exists()
+    has_unpaid = select(Member.id).where(Member.event_id == Event.id, Member.paid == False).exists()
+    return (Event.start_time < expired_before) | ((Event.start_time < paid_before) & has_members & ~has_unpaid)
+
+
+def get_archivable_event_ids(*, expired_before: datetime, paid_before: datetime, limit: int) -> List[int]:
+    """Return up to `limit` ids of events to archive.
+
+    An event is archivable if it started before `expired_before`, or if it
+    started before `paid_before`, has members, and none of them are unpaid.
+    """
+    db = get_session_local()()
+    try:
+        rows = db.query(Event.id).filter(_archivable(expired_before, paid_before)).limit(limit).all()
+        return [event_id for (event_id,) in rows]
+    finally:
+        db.close()
+
+
+def archive_events(event_ids: List[int], *, expired_before: datetime, paid_before: datetime) -> int:
+    """Move the given events and their members into the archive tables in one transaction.
+
+    The events and their members are locked first and the archivable check is
+    re-applied under the lock: a member added or marked paid since the ids were
+    picked either lands before the copy or waits until the move has committed.
+
+    Returns the number of events archived.
+    """
+    if not event_ids:
+        return 0
+    now = datetime.utcnow()
+    db = get_session_local()()
+    try:
+        # Event row locks also block new members (their FK check needs a key-share lock)
+        db.execute(select(Event.id).where(Event.id.in_(event_ids)).with_for_update())
+        db.execute(select(Member.id).where(Member.event_id.in_(event_ids)).with_for_update())
+        event_ids = list(db.execute(
+            select(Event.id).where(Event.id.in_(event_ids), _archivable(expired_before, paid_before))
+        ).scalars())
+        if not event_ids:
+            db.rollback()
+            return 0
+
+        db.execute(
+            insert(ArchivedEvent).from_select(
+                ["id", "natural_key", "title", "amount", "style", "scheduler_interval", "start_time", "admin_id", "archived_at"],
+                select(
+                    Event.id, Event.natural_key, Event.title, Event.amount, Event.style,
+                    Event.scheduler_interval, Event.start_time, Event.admin_id, literal(now),
+                ).where(Event.id.in_(event_ids)),
+            )
+        )
+        db.execute(
+            insert(ArchivedMember).from_select(
+                ["id", "name", "phone", "paid", "event_id"],
+                select(Member.id, Member.name, Member.phone, Member.paid, Member.event_id)
+                .where(Member.event_id.in_(event_ids)),
+            )
+        )
+        db.execute(delete(Member).where(Member.event_id.in_(event_ids)))
+        result = db.execute(delete(Event).where(Event.id.in_(event_ids)))
+        db.commit()
+        return result.rowcount
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def get_archived_events(*, limit: int = 100, offset: int = 0):
+    """Return detached ArchivedEvent objects (members pre-loaded), newest archive first."""
+    db = get_read_session_local()()
+    try:
+        events = (
+            db.query(ArchivedEvent)
+            .options(joinedload(ArchivedEvent.members))
+            .order_by(ArchivedEvent.archived_at.desc(), ArchivedEvent.id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        for e in events:
+            db.expunge(e)
+        return events
+    finally:
+        db.close()
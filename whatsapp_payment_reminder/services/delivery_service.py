@@ -0,0 +1,105 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import FrozenSet, List, Optional
+
+from whatsapp_payment_reminder.services import db_service
+
+logger = logging.getLogger(__name__)
+
+# Intermediate statuses (queued/accepted/sending) are dropped to keep write volume down
+RECORDED_STATUSES = {"sent", "delivered", "read", "failed", "undelivered"}
+
+FAILURE_THRESHOLD = int(os.getenv("DELIVERY_FAILURE_THRESHOLD", "3"))
+FAILURE_LOOKBACK_HOURS = float(os.getenv("DELIVERY_FAILURE_LOOKBACK_HOURS", "48"))
+FAILING_CACHE_SECONDS = 60.0
+
+
+class DeliveryStatusBuffer:
+    """Buffers Twilio status callbacks and writes them to message_deliveries in batches.
+
+    A background thread flushes every `flush_interval` seconds, or as soon as
+    `max_batch` records are pending, so the /status endpoint never waits on the DB.
+    """
+
+    def __init__(self, max_batch: int = 200, flush_interval: float = 5.0):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._pending: List[dict] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, message_sid: str, to: str, status: str, error_code: Optional[str] = None) -> None:
+        if status not in RECORDED_STATUSES:
+            return
+        row = {
+            "message_sid": message_sid,
+            "to_phone": to.replace("whatsapp:", ""),
+            "status": status,
+            "error_code": error_code or None,
+            "received_at": datetime.utcnow(),
+        }
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.max_batch
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write all pending rows in one batch. Returns the number written."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        try:
+            db_service.insert_message_deliveries(batch)
+        except Exception:
+            logger.exception("delivery status flush failed", extra={"rows": len(batch)})
+            with self._lock:
+                self._pending = batch + self._pending
+            return 0
+        return len(batch)
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="delivery-status-flusher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher thread and write whatever is still pending."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+delivery_buffer = DeliveryStatusBuffer(
+    max_batch=int(os.getenv("DELIVERY_FLUSH_BATCH_SIZE", "200")),
+    flush_interval=float(os.getenv("DELIVERY_FLUSH_INTERVAL_SECONDS", "5")),
+)
+
+_failing_cache = (None, frozenset())
+
+
+def get_failing_phones() -> FrozenSet[str]:
+    """Phones whose recent reminders keep failing, refreshed at most once a minute."""
+    global _failing_cache
+    fetched_at, phones = _failing_cache
+    if fetched_at is None or time.monotonic() - fetched_at > FAILING_CACHE_SECONDS:
+        since = datetime.utcnow() - timedelta(hours=FAILURE_LOOKBACK_HOURS)
+        phones = frozenset(db_service.get_failing_phones(since, FAILURE_THRESHOLD))
+        _failing_cache = (time.monotonic(), phones)
+    return phones
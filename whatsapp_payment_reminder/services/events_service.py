@@ -1,9 +1,11 @@
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
 import random
+from typing import Callable, Optional
 from fastapi import HTTPException
 from whatsapp_payment_reminder.services.session_store import session_store
 from whatsapp_payment_reminder.services.whatsapp_utils import send_whatsapp_message
+from whatsapp_payment_reminder.services.delivery_service import get_failing_phones
 from whatsapp_payment_reminder.utils.templates import REMINDER_STYLES, admin_confirmation_msg
 from whatsapp_payment_reminder.services import db_service
 
@@ -55,9 +57,6 @@ def handle_create_event(from_number: str, body: str):
         # --- Calculate start time ---
         start_time = datetime.utcnow() + timedelta(minutes=start_delay_minutes)
 
-        # --- Unique event ID (phone + title) ---
-        event_id = from_number.replace("whatsapp:", "") + "-" + title.lower()
-
         # --- Admin lookup or creation ---
         # --- ✅ Create event in DB ---
         new_event = db_service.create_event(
@@ -70,7 +69,7 @@ def handle_create_event(from_number: str, body: str):
         )
 
         # --- ✅ Track state for adding members ---
-        session_store[from_number] = {"state": "ADDING_MEMBERS", "event_id": event_id}
+        session_store[from_number] = {"state": "ADDING_MEMBERS", "event_id": new_event.id}
 
         # --- ✅ Confirmation to admin ---
         send_whatsapp_message(
@@ -92,17 +91,25 @@ def handle_create_event(from_number: str, body: str):
     except Exception as e:
         send_whatsapp_message(from_number, f"❌ Unexpected error: {str(e)}")
 
-def send_event_reminders(event_id: str):
-    """Send WhatsApp reminders to unpaid members for the given event."""
-    event = db_service.get_event(event_id)
+def send_event_reminders(event_id: int, send: Optional[Callable[[str, str], None]] = None):
+    """Send WhatsApp reminders to unpaid members for the given event.
+
+    `send` overrides the outbound sender (used by the load simulator).
+    """
+    send = send or send_whatsapp_message
+    event = db_service.get_event_row(event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    unpaid_members = db_service.get_unpaid_members(event_id)
+    unpaid_members = db_service.get_unpaid_member_contacts(event_id)
+    # Skip recipients whose recent reminders keep failing to deliver
+    failing_phones = get_failing_phones()
     for member in unpaid_members:
+        if member.phone in failing_phones:
+            continue
         style = event.style if event.style in REMINDER_STYLES else "default"
         template = random.choice(REMINDER_STYLES[style])
         message = template.format(name=member.name, amount=event.amount, event=event.title)
-        send_whatsapp_message(f"whatsapp:{member.phone}", message)
+        send(f"whatsapp:{member.phone}", message)
 
     return {"status": "reminders sent", "event": event_id}
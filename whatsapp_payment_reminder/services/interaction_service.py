@@ -4,6 +4,7 @@ from whatsapp_payment_reminder.services.session_store import session_store
 from whatsapp_payment_reminder.services.events_service import handle_create_event
 from whatsapp_payment_reminder.utils.templates import MAIN_MENU_MSG
 from whatsapp_payment_reminder.services.members_service import handle_add_members
+from whatsapp_payment_reminder.utils import profiling
 
 
 def send_main_menu(to: str):
@@ -16,15 +17,14 @@ def send_main_menu(to: str):
 def show_user_events(from_number: str):
     """Send a list of events the user is part of."""
     phone_number = from_number.replace("whatsapp:", "")
-    events = db_service.get_events_for_member_phone(phone_number)
+    events = db_service.get_member_event_summaries(phone_number)
     if not events:
         send_whatsapp_message(from_number, "📋 אתה לא נמצא באף אירוע עדיין.")
         return
 
     lines = ["📋 אתה חלק מהאירועים הבאים:"]
     for e in events:
-        unpaid_count = len([m for m in e.members if not m.paid])
-        lines.append(f"• *{e.title}* – {e.amount} ({e.style}) | {unpaid_count} לא שילמו")
+        lines.append(f"• *{e.title}* – {e.amount} ({e.style}) | {e.unpaid_count} לא שילמו")
     send_whatsapp_message(from_number, "\n".join(lines))
 
 
@@ -78,28 +78,24 @@ def handle_delay_step(from_number: str, body: str):
 
 
 # ---------------- State dispatcher -----------------
+_STATE_HANDLERS = {
+    "CREATING_EVENT_NAME": handle_name_step,
+    "CREATING_EVENT_AMOUNT": handle_amount_step,
+    "CREATING_EVENT_STYLE": handle_style_step,
+    "CREATING_EVENT_FREQ": handle_freq_step,
+    "CREATING_EVENT_DELAY": handle_delay_step,
+    "ADDING_MEMBERS": handle_add_members,
+}
+
+
 def handle_state(from_number: str, body: str, state: dict) -> bool:
     """Handle non-IDLE wizard/member states. Returns True if handled."""
-    current = state.get("state")
-    if current == "CREATING_EVENT_NAME":
-        handle_name_step(from_number, body)
-        return True
-    if current == "CREATING_EVENT_AMOUNT":
-        handle_amount_step(from_number, body)
-        return True
-    if current == "CREATING_EVENT_STYLE":
-        handle_style_step(from_number, body)
-        return True
-    if current == "CREATING_EVENT_FREQ":
-        handle_freq_step(from_number, body)
-        return True
-    if current == "CREATING_EVENT_DELAY":
-        handle_delay_step(from_number, body)
-        return True
-    if current == "ADDING_MEMBERS":
-        handle_add_members(from_number, body)
-        return True
-    return False
+    handler = _STATE_HANDLERS.get(state.get("state"))
+    profiling.annotate(session_state=dict(state), handler=handler.__name__ if handler else None)
+    if handler is None:
+        return False
+    handler(from_number, body)
+    return True
 
 
 def get_user_state(from_number: str) -> dict:
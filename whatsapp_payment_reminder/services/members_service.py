@@ -1,7 +1,8 @@
 from whatsapp_payment_reminder.services import db_service
 from whatsapp_payment_reminder.services.whatsapp_utils import send_whatsapp_message
 from whatsapp_payment_reminder.services.session_store import session_store
-from typing import List
+from whatsapp_payment_reminder.services.payment_digest import payment_digest
+from typing import List, Optional
 import re
 
 def parse_members_from_text(text: str) -> List[dict]:
@@ -32,7 +33,7 @@ def handle_add_members(from_number: str, body: str):
     """Handle member additions"""
     state = session_store[from_number]
     event_id = state["event_id"]
-    event = db_service.get_event(event_id)
+    event = db_service.get_event_row(event_id)
 
     if body.lower().strip() == "done":
         session_store[from_number] = {"state": "IDLE"}
@@ -54,7 +55,11 @@ def handle_add_members(from_number: str, body: str):
     send_whatsapp_message(from_number,
         f"✅ נוספו {len(members)} משתתפים ל-*{event.title}* עד כה.\nשלח עוד או כתוב 'done' לסיום.")
 
-def notify_admin_by_ids(member_name: str, member_phone: str, event_title: str, admin_id: int):
+def notify_admin_by_ids(member_name: str, member_phone: str, event_title: str, admin_id: int, event_id: Optional[int] = None):
+    if event_id and payment_digest.enabled:
+        # Digest mode: the admin gets one summary per window instead of a message per payment
+        payment_digest.add(admin_id, event_id, event_title, member_name)
+        return
     admin = db_service.get_admin(admin_id)
     if admin:
         send_whatsapp_message(
@@ -75,7 +80,7 @@ def handle_mark_paid(from_number: str, body: str):
             member_name, member_phone, event_title, admin_id = result
             send_whatsapp_message(from_number,
                                  f"✅ תודה {member_name}! סומן כשולם עבור *{event_title}*.")
-            notify_admin_by_ids(member_name, member_phone, event_title, admin_id)
+            notify_admin_by_ids(member_name, member_phone, event_title, admin_id, event_id=event_context)
         else:
             send_whatsapp_message(from_number,
                 "⚠️ כבר סומנת כשולם עבור האירוע הזה.")
@@ -96,7 +101,7 @@ def handle_mark_paid(from_number: str, body: str):
                     member_name, member_phone, event_title, admin_id = result
                     send_whatsapp_message(from_number,
                                          f"✅ תודה {member_name}! סומן כשולם עבור *{event_title}*.")
-                    notify_admin_by_ids(member_name, member_phone, event_title, admin_id)
+                    notify_admin_by_ids(member_name, member_phone, event_title, admin_id, event_id=match_member.event_id)
                 return
 
         if len(unpaid) == 0:
@@ -109,7 +114,7 @@ def handle_mark_paid(from_number: str, body: str):
                 member_name, member_phone, event_title, admin_id = result
                 send_whatsapp_message(from_number,
                                      f"✅ תודה {member_name}! סומן כשולם עבור *{event_title}*.")
-                notify_admin_by_ids(member_name, member_phone, event_title, admin_id)
+                notify_admin_by_ids(member_name, member_phone, event_title, admin_id, event_id=member.event_id)
         else:
             event_titles = ", ".join([m.event.title for m in unpaid])
             send_whatsapp_message(from_number,
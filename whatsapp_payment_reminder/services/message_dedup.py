@@ -0,0 +1,103 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from whatsapp_payment_reminder.services import db_service
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_DEDUP_PRUNE_INTERVAL_MINUTES = 60
+
+
+class MessageDeduplicator:
+    """Drops Twilio webhook retries by remembering recently seen MessageSids.
+
+    A bounded in-memory LRU answers most retries; when `shared` is on, the
+    `processed_messages` table catches retries that land on another replica.
+    """
+
+    def __init__(self, max_size: int = 10000, shared: bool = False, ttl_hours: float = 48):
+        self.max_size = max_size
+        self.shared = shared
+        self.ttl_hours = ttl_hours
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def is_duplicate(self, message_sid: str) -> bool:
+        """Mark `message_sid` as processed; return True if it already was."""
+        if not message_sid:
+            return False
+        with self._lock:
+            if message_sid in self._seen:
+                self._seen.move_to_end(message_sid)
+                self.memory_hits += 1
+                return True
+            self._remember(message_sid)
+
+        if self.shared:
+            try:
+                first_seen = db_service.record_processed_message(message_sid)
+            except Exception:
+                # Nothing was recorded, so Twilio's retry must not be answered as a duplicate
+                with self._lock:
+                    self._seen.pop(message_sid, None)
+                raise
+            if not first_seen:
+                with self._lock:
+                    self.shared_hits += 1
+                return True
+
+        with self._lock:
+            self.misses += 1
+        return False
+
+    def forget(self, message_sid: str) -> None:
+        """Un-mark a sid whose processing failed so Twilio's retry is handled."""
+        if not message_sid:
+            return
+        with self._lock:
+            self._seen.pop(message_sid, None)
+        if self.shared:
+            db_service.delete_processed_message(message_sid)
+
+    def prune_shared(self, now: Optional[datetime] = None) -> int:
+        """Delete shared sids older than `ttl_hours` (Twilio only retries within minutes).
+
+        Returns the number of rows deleted.
+        """
+        if not self.shared or self.ttl_hours <= 0:
+            return 0
+        cutoff = (now or datetime.utcnow()) - timedelta(hours=self.ttl_hours)
+        deleted = db_service.delete_processed_messages_before(cutoff)
+        if deleted:
+            logger.info("pruned processed messages", extra={"deleted": deleted})
+        return deleted
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.memory_hits + self.shared_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.shared_hits) / total, 4) if total else 0.0,
+                "cached": len(self._seen),
+            }
+
+    def _remember(self, message_sid: str) -> None:
+        self._seen[message_sid] = True
+        if len(self._seen) > self.max_size:
+            self._seen.popitem(last=False)
+
+
+message_deduplicator = MessageDeduplicator(
+    max_size=int(os.getenv("WEBHOOK_DEDUP_CACHE_SIZE", "10000")),
+    shared=os.getenv("WEBHOOK_DEDUP_SHARED", "").lower() in ("1", "true", "yes"),
+    ttl_hours=float(os.getenv("WEBHOOK_DEDUP_TTL_HOURS", "48")),  # 0 keeps sids forever
+)
@@ -0,0 +1,81 @@
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+from whatsapp_payment_reminder.services import db_service
+from whatsapp_payment_reminder.services.whatsapp_utils import send_whatsapp_message
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentDigestBuffer:
+    """Collects payment notifications per admin and sends one summary per admin per window.
+
+    With `window_seconds` of 0 the buffer is disabled and callers notify admins directly.
+    """
+
+    def __init__(self, window_seconds: float = 0):
+        self.window_seconds = window_seconds
+        # admin_id -> event_id -> {"title": str, "payers": [member_name, ...]}
+        self._pending: Dict[int, Dict[int, dict]] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0
+
+    def add(self, admin_id: int, event_id: int, event_title: str, member_name: str) -> None:
+        with self._lock:
+            entry = self._pending.setdefault(admin_id, {}).setdefault(event_id, {"title": event_title, "payers": []})
+            entry["payers"].append(member_name)
+
+    def flush(self) -> int:
+        """Send one digest per admin with pending payments. Returns the number of digests sent."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        sent = 0
+        for admin_id, events in batch.items():
+            try:
+                admin = db_service.get_admin(admin_id)
+                if not admin:
+                    continue
+                send_whatsapp_message(f"whatsapp:{admin.phone}", self._format_digest(events))
+                sent += 1
+            except Exception:
+                logger.exception("payment digest failed", extra={"admin_id": admin_id})
+        return sent
+
+    def start(self) -> None:
+        if self.enabled and (self._thread is None or not self._thread.is_alive()):
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="payment-digest-flusher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher thread and send whatever is still pending."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.window_seconds):
+            self.flush()
+
+    @staticmethod
+    def _format_digest(events: Dict[int, dict]) -> str:
+        lines: List[str] = ["\u200F🧾 סיכום תשלומים:"]
+        for event_id, entry in events.items():
+            lines.append(f"• *{entry['title']}* – שילמו: {', '.join(entry['payers'])}")
+            stats = db_service.get_event_payment_stats(event_id)
+            if stats:
+                paid, unpaid, amount = stats
+                lines.append(f"  נותרו {unpaid} שלא שילמו | נאסף עד כה {paid * (amount or 0):g}")
+        return "\n".join(lines)
+
+
+payment_digest = PaymentDigestBuffer(window_seconds=float(os.getenv("ADMIN_DIGEST_WINDOW_SECONDS", "0")))
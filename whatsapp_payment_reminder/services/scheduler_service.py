@@ -1,19 +1,114 @@
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+import threading
+import time
+import zlib
 
-from whatsapp_payment_reminder.services.db_service import get_all_events
+from whatsapp_payment_reminder.services.db_service import get_all_event_rows
 from whatsapp_payment_reminder.services.events_service import send_event_reminders
+from whatsapp_payment_reminder.services.whatsapp_utils import send_whatsapp_message
+
+QuietHours = Tuple[int, int]  # (start_hour, end_hour) in UTC, may wrap midnight
+
+
+def is_event_due(event, now: datetime) -> bool:
+    """Return True if `event` should get reminders in the cycle running at `now`."""
+    if now < event.start_time:
+        return False
+
+    time_since_start = (now - event.start_time).total_seconds() / 60
+    return time_since_start % event.scheduler_interval < 1
+
+
+def dispatch_offset(event_id: int, window_seconds: float) -> float:
+    """Deterministic per-event delay in [0, window_seconds) so an event always lands in the same slot."""
+    if window_seconds <= 0:
+        return 0.0
+    return (zlib.crc32(str(event_id).encode()) % 10000) / 10000 * window_seconds
+
+
+def parse_quiet_hours(raw: str) -> Optional[QuietHours]:
+    """Parse "22-7" into (22, 7). Empty string disables quiet hours."""
+    if not raw:
+        return None
+    start, end = raw.split("-", 1)
+    return int(start), int(end)
+
+
+def in_quiet_hours(t: datetime, quiet_hours: QuietHours) -> bool:
+    start, end = quiet_hours
+    if start <= end:
+        return start <= t.hour < end
+    return t.hour >= start or t.hour < end
+
+
+def quiet_hours_end(t: datetime, quiet_hours: QuietHours) -> datetime:
+    """First moment after `t` at which quiet hours are over."""
+    end = t.replace(hour=quiet_hours[1], minute=0, second=0, microsecond=0)
+    if end <= t:
+        end += timedelta(days=1)
+    return end
+
+
+class RateLimiter:
+    """Paces callers to at most `rate` acquisitions per second (0 disables pacing)."""
+
+    def __init__(self, rate: float, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self._clock = clock
+        self._sleep = sleep
+        self._next_slot: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = self._clock()
+            slot = now if self._next_slot is None else max(now, self._next_slot)
+            self._next_slot = slot + 1 / self.rate
+        if slot > now:
+            self._sleep(slot - now)
 
 
 class ReminderScheduler:
-    """Background scheduler that periodically checks events and sends reminders."""
+    """Background scheduler that periodically checks events and sends reminders.
+
+    Due events are spread over `dispatch_window_seconds` using a per-event
+    deterministic offset, outbound messages are paced to
+    `max_messages_per_second`, and sends falling in `quiet_hours` are deferred
+    to the end of the quiet period instead of being dropped.
 
-    def __init__(self, interval_minutes: int = 1):
+    Sends run on their own "reminders" executor (`send_workers` threads) so
+    rate-limiter sleeps can never delay the cycle or maintenance jobs past
+    their misfire grace time.
+    """
+
+    def __init__(
+        self,
+        interval_minutes: int = 1,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        send: Optional[Callable[[str, str], None]] = None,
+        dispatch_window_seconds: float = 0,
+        max_messages_per_second: float = 0,
+        quiet_hours: Optional[QuietHours] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        send_workers: int = 10,
+    ):
 
         self.interval_minutes = interval_minutes
-        self._scheduler = BackgroundScheduler()
+        # clock/send are injectable so the load simulator can drive cycles on a virtual clock
+        self._clock = clock
+        self._send = send or send_whatsapp_message
+        self.dispatch_window_seconds = dispatch_window_seconds
+        self.quiet_hours = quiet_hours
+        self._rate_limiter = rate_limiter or RateLimiter(max_messages_per_second)
+        self._scheduler = BackgroundScheduler(timezone="UTC")
+        self._scheduler.add_executor(ThreadPoolExecutor(send_workers), "reminders")
         # Schedule the job
-        self._scheduler.add_job(self._reminder_cycle, "interval", minutes=self.interval_minutes, id="reminder_cycle")
+        self.add_interval_job(self._reminder_cycle, self.interval_minutes, "reminder_cycle")
 
     def start(self) -> None:
         """Start the background scheduler (non-blocking)."""
@@ -25,18 +120,77 @@ class ReminderScheduler:
         if self._scheduler.running:
             self._scheduler.shutdown()
 
+    def add_interval_job(self, func: Callable[[], object], minutes: float, job_id: str) -> None:
+        """Run `func` every `minutes` on the same background scheduler (maintenance jobs).
+
+        A run that starts late still happens (once, however many were missed)
+        as long as the next one isn't due yet.
+        """
+        self._scheduler.add_job(
+            func,
+            "interval",
+            minutes=minutes,
+            id=job_id,
+            replace_existing=True,
+            coalesce=True,
+            misfire_grace_time=int(minutes * 60),
+        )
+
+    def run_cycle(self) -> int:
+        """Run one reminder cycle now (per the clock). Returns the number of events dispatched."""
+        events = get_all_event_rows()
+        now = self._clock()
+        dispatched = 0
+        for event in events:
+            if is_event_due(event, now):
+                self._dispatch(self.send_time(event.id, now, event.scheduler_interval), event.id)
+                dispatched += 1
+        return dispatched
+
+    def send_time(self, event_id: int, now: datetime, interval_minutes: Optional[float] = None) -> datetime:
+        """When the reminders for `event_id`, due at `now`, should go out.
+
+        The offset is capped at the event's reminder interval: a send pushed past
+        the next due cycle would be replaced by that cycle's job and never fire.
+        """
+        window = self.dispatch_window_seconds
+        if interval_minutes:
+            window = min(window, interval_minutes * 60)
+        offset = timedelta(seconds=dispatch_offset(event_id, window))
+        send_at = now + offset
+        if self.quiet_hours and in_quiet_hours(send_at, self.quiet_hours):
+            send_at = quiet_hours_end(send_at, self.quiet_hours) + offset
+        return send_at
+
+    def send_reminders(self, event_id: int) -> None:
+        """Send one event's reminders through the paced sender."""
+        send_event_reminders(event_id, send=self._paced_send)
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
     def _reminder_cycle(self) -> None:
         """Send reminders for all events that are due in this cycle."""
-        events = get_all_events()
-        now = datetime.utcnow()
-        for event in events:
-            if now < event.start_time:
-                continue
+        self.run_cycle()
 
-            time_since_start = (now - event.start_time).total_seconds() / 60
+    def _dispatch(self, send_at: datetime, event_id: int) -> None:
+        due_now = send_at <= self._clock()
+        if due_now and not self._scheduler.running:
+            self.send_reminders(event_id)
+            return
+        # One pending job per event: a deferred reminder that comes due again is not sent twice.
+        # Due-now sends go through the executor too, so pacing never blocks run_cycle.
+        self._scheduler.add_job(
+            self.send_reminders,
+            "date",
+            run_date=None if due_now else send_at,
+            executor="reminders",
+            args=[event_id],
+            id=f"reminder:{event_id}",
+            replace_existing=True,
+            misfire_grace_time=None,
+        )
 
-            if time_since_start % event.scheduler_interval < 1:
-                send_event_reminders(event.id)
+    def _paced_send(self, to: str, message: str) -> None:
+        self._rate_limiter.acquire()
+        self._send(to, message)
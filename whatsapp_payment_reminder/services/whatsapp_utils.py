@@ -1,17 +1,38 @@
+import logging
 import os
-from twilio.rest import Client
 
-account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-auth_token = os.getenv("TWILIO_AUTH_TOKEN")
+from whatsapp_payment_reminder.utils.startup_timing import startup_timer
+
+logger = logging.getLogger(__name__)
 
 twilio_number = "whatsapp:+14155238886"
-client = Client(account_sid, auth_token)
+# Public URL of our /status endpoint; when set Twilio posts delivery updates there
+status_callback_url = os.getenv("TWILIO_STATUS_CALLBACK_URL")
+
+_client = None
+
+
+def get_client():
+    """Return the shared Twilio client, creating it on first use."""
+    global _client
+    if _client is None:
+        # Imported lazily, so its cost shows up in the startup report only once a message is sent
+        with startup_timer.measure_import("twilio"):
+            from twilio.rest import Client
+
+        _client = Client(os.getenv("TWILIO_ACCOUNT_SID"), os.getenv("TWILIO_AUTH_TOKEN"))
+    return _client
+
 
 def send_whatsapp_message(to: str, message: str):
     """Send WhatsApp message via Twilio sandbox."""
-    print(f"📤 Sending message to {to}: {message}")
-    client.messages.create(
+    kwargs = {}
+    if status_callback_url:
+        kwargs["status_callback"] = status_callback_url
+    get_client().messages.create(
         from_=twilio_number,
         body=message,
-        to=to
+        to=to,
+        **kwargs
     )
+    logger.info("whatsapp message sent", extra={"to": to, "chars": len(message)})
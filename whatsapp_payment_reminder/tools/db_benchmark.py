@@ -0,0 +1,211 @@
+"""Micro-benchmarks for db_service.
+
+Seeds the database at several sizes and times the hot db_service functions,
+emitting JSON so scaling curves can be compared across versions.
+
+    python -m whatsapp_payment_reminder.tools.db_benchmark --sizes 100,1000,10000 --label my-branch
+
+Runs against a fresh SQLite file unless --database-url or DATABASE_URL is
+set (e.g. PostgreSQL); that database additionally needs --allow-reset,
+since every table is dropped and recreated for each size.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from whatsapp_payment_reminder.tools import seeding
+
+OPERATIONS = (
+    "get_all_events",
+    "get_all_event_rows",
+    "get_unpaid_members",
+    "get_unpaid_member_contacts",
+    "get_unpaid_members_by_phone",
+    "get_events_for_member_phone",
+    "get_member_event_summaries",
+    "set_member_paid",
+    "add_members_to_event",
+)
+
+
+def seed_database(engine, *, n_events: int, members_per_event: int, events_per_admin: int, events_per_phone: int, seed: int) -> dict:
+    """Insert admins, events and members; return the ids/phones the benchmarks pick from."""
+    rng = random.Random(seed)
+    n_admins = max(1, n_events // events_per_admin)
+    # Phone pool sized so each phone belongs to ~events_per_phone events
+    n_phones = max(1, n_events * members_per_event // events_per_phone)
+    phones = [f"+9725{i:08d}" for i in range(n_phones)]
+    unpaid_memberships = []
+
+    def make_event(i: int) -> dict:
+        return {
+            "title": f"bench{i}",
+            "amount": 50.0,
+            "style": "mafia",
+            "scheduler_interval": 60.0,
+            "start_time": datetime(2025, 1, 1),
+            "admin_id": i % n_admins + 1,
+        }
+
+    def make_members(event_id: int) -> List[dict]:
+        members = []
+        for phone in rng.sample(phones, min(members_per_event, n_phones)):
+            paid = rng.random() < 0.3
+            members.append({"name": "bench", "phone": phone, "paid": paid})
+            if not paid:
+                unpaid_memberships.append((phone, event_id))
+        return members
+
+    event_ids = seeding.seed_events(engine, n_events=n_events, n_admins=n_admins, make_event=make_event, make_members=make_members)
+    return {"event_ids": event_ids, "phones": phones, "unpaid_memberships": unpaid_memberships}
+
+
+def time_operation(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {
+        "repeat": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def run_size(engine, *, n_events: int, members_per_event: int, events_per_admin: int, events_per_phone: int, repeat: int, seed: int) -> dict:
+    from whatsapp_payment_reminder.db.database import Base
+    from whatsapp_payment_reminder.services import db_service
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    t0 = time.perf_counter()
+    data = seed_database(
+        engine,
+        n_events=n_events,
+        members_per_event=members_per_event,
+        events_per_admin=events_per_admin,
+        events_per_phone=events_per_phone,
+        seed=seed,
+    )
+    seed_seconds = time.perf_counter() - t0
+
+    rng = random.Random(seed + 1)
+    event_ids, phones = data["event_ids"], data["phones"]
+    # set_member_paid gets its own unpaid membership per call so none hits the already-paid early return
+    to_mark = rng.sample(data["unpaid_memberships"], min(repeat, len(data["unpaid_memberships"])))
+
+    ops = {
+        "get_all_events": lambda: db_service.get_all_events(),
+        "get_all_event_rows": lambda: db_service.get_all_event_rows(),
+        "get_unpaid_members": lambda: db_service.get_unpaid_members(rng.choice(event_ids)),
+        "get_unpaid_member_contacts": lambda: db_service.get_unpaid_member_contacts(rng.choice(event_ids)),
+        "get_unpaid_members_by_phone": lambda: db_service.get_unpaid_members_by_phone(rng.choice(phones)),
+        "get_events_for_member_phone": lambda: db_service.get_events_for_member_phone(rng.choice(phones)),
+        "get_member_event_summaries": lambda: db_service.get_member_event_summaries(rng.choice(phones)),
+        "set_member_paid": lambda: db_service.set_member_paid(*to_mark.pop()),
+        "add_members_to_event": lambda: db_service.add_members_to_event(
+            rng.choice(event_ids),
+            [{"name": "added", "phone": f"+9726{rng.randrange(10**8):08d}"} for _ in range(10)],
+        ),
+    }
+    results = {}
+    for name in OPERATIONS:
+        n = len(to_mark) if name == "set_member_paid" else repeat
+        results[name] = time_operation(ops[name], n)
+
+    return {
+        "events": n_events,
+        "members": n_events * members_per_event,
+        "phones": len(phones),
+        "seed_seconds": round(seed_seconds, 3),
+        "operations": results,
+    }
+
+
+def run_benchmarks(
+    *,
+    sizes: List[int],
+    members_per_event: int = 10,
+    events_per_admin: int = 5,
+    events_per_phone: int = 3,
+    repeat: int = 20,
+    seed: int = 42,
+    database_url: Optional[str] = None,
+    allow_reset: bool = False,
+    label: Optional[str] = None,
+) -> dict:
+    database_url = database_url or os.getenv("DATABASE_URL")
+    if not database_url:
+        database_url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="db-bench-"), "bench.db")
+    elif not allow_reset:
+        raise SystemExit(f"Refusing to drop tables on {database_url.split('@')[-1]} without --allow-reset")
+    engine = seeding.use_database(database_url)
+    return {
+        "label": label,
+        "dialect": engine.dialect.name,
+        "config": {
+            "members_per_event": members_per_event,
+            "events_per_admin": events_per_admin,
+            "events_per_phone": events_per_phone,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": [
+            run_size(
+                engine,
+                n_events=size,
+                members_per_event=members_per_event,
+                events_per_admin=events_per_admin,
+                events_per_phone=events_per_phone,
+                repeat=repeat,
+                seed=seed,
+            )
+            for size in sizes
+        ],
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark db_service at several data sizes.")
+    parser.add_argument("--sizes", default="100,1000,10000", help="comma-separated event counts")
+    parser.add_argument("--members-per-event", type=int, default=10)
+    parser.add_argument("--events-per-admin", type=int, default=5)
+    parser.add_argument("--events-per-phone", type=int, default=3, help="average events each member phone belongs to")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--allow-reset", action="store_true", help="allow dropping and recreating tables on the given database")
+    parser.add_argument("--label", default=None, help="free-form version tag stored in the output")
+    parser.add_argument("--output", default=None, help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        sizes=[int(s) for s in args.sizes.split(",") if s],
+        members_per_event=args.members_per_event,
+        events_per_admin=args.events_per_admin,
+        events_per_phone=args.events_per_phone,
+        repeat=args.repeat,
+        seed=args.seed,
+        database_url=args.database_url,
+        allow_reset=args.allow_reset,
+        label=args.label,
+    )
+    out = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out)
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
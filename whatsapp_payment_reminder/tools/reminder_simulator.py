@@ -0,0 +1,308 @@
+"""Reminder load simulator.
+
+Seeds a throwaway SQLite database with synthetic events and replays the
+reminder scheduler against a virtual clock and a stub sender, so days of
+schedule run in seconds without touching Twilio.
+
+Dispatched sends are replayed in virtual time rather than through
+APScheduler, so executor saturation and misfired jobs are not modelled:
+the report shows what the dispatch policy produces, not thread-pool effects.
+
+    python -m whatsapp_payment_reminder.tools.reminder_simulator --events 50000 --days 2
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import event as sa_event
+
+from whatsapp_payment_reminder.tools import seeding
+
+# (minutes, weight) - round values, like the ones admins type into freq=/delay=
+INTERVAL_CHOICES = [(15, 1), (30, 3), (60, 6), (120, 3), (240, 2), (1440, 2)]
+DELAY_CHOICES = [(0, 6), (5, 2), (10, 3), (30, 2), (60, 1)]
+
+
+class VirtualClock:
+    """Clock the scheduler reads instead of datetime.utcnow()."""
+
+    def __init__(self, start: datetime):
+        self._now = start
+
+    def now(self) -> datetime:
+        return self._now
+
+    def advance(self, minutes: float) -> None:
+        self._now += timedelta(minutes=minutes)
+
+    def set(self, when: datetime) -> None:
+        self._now = when
+
+    def monotonic(self) -> float:
+        """Virtual seconds, for the scheduler's rate limiter."""
+        return self._now.timestamp()
+
+    def sleep(self, seconds: float) -> None:
+        self._now += timedelta(seconds=seconds)
+
+
+class StubSender:
+    """Records outbound messages per virtual minute instead of sending them."""
+
+    def __init__(self, clock: VirtualClock, start: datetime):
+        self._clock = clock
+        self._start = start
+        self.per_minute = Counter()
+        self.total = 0
+
+    def __call__(self, to: str, message: str) -> None:
+        minute = int((self._clock.now() - self._start).total_seconds() // 60)
+        self.per_minute[minute] += 1
+        self.total += 1
+
+
+class DBTimer:
+    """Accumulates time spent in cursor execution on an engine."""
+
+    def __init__(self, engine):
+        self.seconds = 0.0
+        sa_event.listen(engine, "before_cursor_execute", self._before)
+        sa_event.listen(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sim_query_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        self.seconds += time.perf_counter() - conn.info["sim_query_start"].pop()
+
+
+def _make_virtual_scheduler(**kwargs):
+    # Imported late: the app modules must not load before DATABASE_URL points at the simulation DB
+    from whatsapp_payment_reminder.services.scheduler_service import ReminderScheduler
+
+    class VirtualDispatchScheduler(ReminderScheduler):
+        """Keeps dispatched sends in `pending` instead of APScheduler date jobs."""
+
+        def __init__(self, **kw):
+            super().__init__(**kw)
+            self.pending = {}
+
+        def _dispatch(self, send_at, event_id):
+            # Same replace-existing semantics as the real date jobs
+            self.pending[event_id] = send_at
+
+        def pop_due(self, until: datetime):
+            due = sorted((at, eid) for eid, at in self.pending.items() if at < until)
+            for _, eid in due:
+                del self.pending[eid]
+            return due
+
+    return VirtualDispatchScheduler(**kwargs)
+
+
+def _weighted(rng: random.Random, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights)[0]
+
+
+def seed_events(
+    engine,
+    *,
+    n_events: int,
+    members_per_event: int,
+    start: datetime,
+    created_spread_hours: float,
+    seed: int,
+) -> None:
+    """Insert `n_events` synthetic events (and their unpaid members) in bulk."""
+    rng = random.Random(seed)
+    n_admins = max(1, n_events // 10)
+
+    def make_event(i: int) -> dict:
+        admin_id = rng.randint(1, n_admins)
+        created = start - timedelta(seconds=rng.uniform(0, created_spread_hours * 3600))
+        delay = _weighted(rng, DELAY_CHOICES)
+        return {
+            "title": f"event{i}",
+            "amount": float(rng.choice([20, 50, 100])),
+            "style": rng.choice(["mafia", "grandpa", "broker"]),
+            "scheduler_interval": float(_weighted(rng, INTERVAL_CHOICES)),
+            "start_time": created + timedelta(minutes=delay),
+            "admin_id": admin_id,
+        }
+
+    def make_members(event_id: int) -> List[dict]:
+        return [
+            {"name": f"member{j}", "phone": f"+972{rng.randint(0, 10**8 - 1):08d}", "paid": False}
+            for j in range(members_per_event)
+        ]
+
+    seeding.seed_events(engine, n_events=n_events, n_admins=n_admins, make_event=make_event, make_members=make_members)
+
+
+def _summary(values: List[float]) -> dict:
+    if not values:
+        return {"total": 0.0, "mean": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    return {
+        "total": round(sum(ordered), 4),
+        "mean": round(sum(ordered) / len(ordered), 6),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 6),
+        "max": round(ordered[-1], 6),
+    }
+
+
+def run_simulation(
+    *,
+    n_events: int = 1000,
+    members_per_event: int = 5,
+    days: float = 1.0,
+    tick_minutes: float = 1.0,
+    created_spread_hours: float = 24.0,
+    seed: int = 42,
+    database_url: Optional[str] = None,
+    top_bursts: int = 10,
+    dispatch_window_seconds: float = 0,
+    max_messages_per_second: float = 0,
+    quiet_hours: Optional[str] = None,
+    trace_memory: bool = False,
+) -> dict:
+    """Seed, replay `days` of reminder cycles, and return the load report."""
+    if database_url is None:
+        database_url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="reminder-sim-"), "sim.db")
+    engine = seeding.use_database(database_url)
+
+    from whatsapp_payment_reminder.db.database import Base
+    from whatsapp_payment_reminder.services.scheduler_service import RateLimiter, parse_quiet_hours
+
+    Base.metadata.create_all(bind=engine)
+
+    start = datetime(2025, 1, 1)
+    seed_events(
+        engine,
+        n_events=n_events,
+        members_per_event=members_per_event,
+        start=start,
+        created_spread_hours=created_spread_hours,
+        seed=seed,
+    )
+
+    clock = VirtualClock(start)
+    sender = StubSender(clock, start)
+    db_timer = DBTimer(engine)
+    scheduler = _make_virtual_scheduler(
+        interval_minutes=tick_minutes,
+        clock=clock.now,
+        send=sender,
+        dispatch_window_seconds=dispatch_window_seconds,
+        quiet_hours=parse_quiet_hours(quiet_hours or ""),
+        rate_limiter=RateLimiter(max_messages_per_second, clock=clock.monotonic, sleep=clock.sleep),
+    )
+
+    cycles = int(days * 24 * 60 / tick_minutes)
+    wall, cpu, db, peak_kib = [], [], [], []
+    if trace_memory:
+        tracemalloc.start()
+    wall_start = time.perf_counter()
+    for k in range(cycles):
+        cycle_at = start + timedelta(minutes=k * tick_minutes)
+        clock.set(cycle_at)
+        db_before = db_timer.seconds
+        if trace_memory:
+            tracemalloc.reset_peak()
+            mem_before = tracemalloc.get_traced_memory()[0]
+        t0, c0 = time.perf_counter(), time.process_time()
+        scheduler.run_cycle()
+        # Replay the sends scheduled before the next cycle; pacing sleeps move the clock forward
+        for send_at, event_id in scheduler.pop_due(cycle_at + timedelta(minutes=tick_minutes)):
+            clock.set(max(clock.now(), send_at))
+            scheduler.send_reminders(event_id)
+        wall.append(time.perf_counter() - t0)
+        cpu.append(time.process_time() - c0)
+        db.append(db_timer.seconds - db_before)
+        if trace_memory:
+            peak_kib.append((tracemalloc.get_traced_memory()[1] - mem_before) / 1024)
+    if trace_memory:
+        tracemalloc.stop()
+
+    cycle_stats = {
+        "count": cycles,
+        "wall_seconds": _summary(wall),
+        "cpu_seconds": _summary(cpu),
+        "db_seconds": _summary(db),
+    }
+    if trace_memory:
+        # tracemalloc slows the cycle down; compare wall/cpu only between runs with the same flag
+        cycle_stats["peak_alloc_kib"] = _summary(peak_kib)
+
+    last_minute = max(sender.per_minute, default=0)
+    histogram = [sender.per_minute.get(m, 0) for m in range(max(int(days * 24 * 60), last_minute + 1))]
+    return {
+        "config": {
+            "events": n_events,
+            "members_per_event": members_per_event,
+            "days": days,
+            "tick_minutes": tick_minutes,
+            "seed": seed,
+            "dispatch_window_seconds": dispatch_window_seconds,
+            "max_messages_per_second": max_messages_per_second,
+            "quiet_hours": quiet_hours,
+        },
+        "simulated_in_seconds": round(time.perf_counter() - wall_start, 3),
+        "messages_total": sender.total,
+        "deferred_pending": len(scheduler.pending),
+        "per_minute_histogram": histogram,
+        "peak_bursts": [
+            {"minute": minute, "messages": count}
+            for minute, count in sender.per_minute.most_common(top_bursts)
+        ],
+        "cycles": cycle_stats,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate reminder traffic on a virtual clock.")
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--members-per-event", type=int, default=5)
+    parser.add_argument("--days", type=float, default=1.0)
+    parser.add_argument("--tick-minutes", type=float, default=1.0, help="virtual minutes between scheduler cycles")
+    parser.add_argument("--created-spread-hours", type=float, default=24.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dispatch-window-seconds", type=float, default=0)
+    parser.add_argument("--max-mps", type=float, default=0, help="target outbound messages per second (0 = unpaced)")
+    parser.add_argument("--quiet-hours", default=None, help='UTC hours, e.g. "22-7"')
+    parser.add_argument("--trace-memory", action="store_true", help="record per-cycle peak allocations (slower)")
+    parser.add_argument("--database-url", default=None, help="defaults to a fresh SQLite file in a temp dir")
+    parser.add_argument("--output", default=None, help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_simulation(
+        n_events=args.events,
+        members_per_event=args.members_per_event,
+        days=args.days,
+        tick_minutes=args.tick_minutes,
+        created_spread_hours=args.created_spread_hours,
+        seed=args.seed,
+        database_url=args.database_url,
+        dispatch_window_seconds=args.dispatch_window_seconds,
+        max_messages_per_second=args.max_mps,
+        quiet_hours=args.quiet_hours,
+        trace_memory=args.trace_memory,
+    )
+    out = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out)
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Database setup and bulk seeding shared by the simulator and the benchmark."""
+import os
+from typing import Callable, List
+
+from sqlalchemy import insert
+
+
+def use_database(database_url: str):
+    """Point the app at `database_url` and return its engine (SQL echo off)."""
+    # The app reads DATABASE_URL lazily, so point it at the tool's DB before first use
+    os.environ["DATABASE_URL"] = database_url
+    # Seeded data only exists on this database, so keep every read on it
+    os.environ.pop("DATABASE_REPLICA_URL", None)
+
+    from whatsapp_payment_reminder.db.database import get_engine
+    from whatsapp_payment_reminder.db import db_models  # noqa: F401  (register tables)
+
+    engine = get_engine()
+    engine.echo = False
+    return engine
+
+
+def admin_phone(index: int) -> str:
+    return f"+1555{index:07d}"
+
+
+def seed_events(
+    engine,
+    *,
+    n_events: int,
+    n_admins: int,
+    make_event: Callable[[int], dict],
+    make_members: Callable[[int], List[dict]],
+) -> List[int]:
+    """Bulk-insert `n_admins` admins and `n_events` events with their members.
+
+    `make_event(i)` returns the event's title, amount, style,
+    scheduler_interval, start_time and admin_id (1-based). `make_members(event_id)`
+    returns member rows (name, phone, paid). Ids and natural keys are filled in
+    here. Returns the event ids.
+    """
+    from whatsapp_payment_reminder.db.db_models import Admin, Event, Member
+
+    event_ids: List[int] = []
+    events, members = [], []
+    for i in range(n_events):
+        event_id = i + 1
+        event = make_event(i)
+        events.append({
+            **event,
+            "id": event_id,
+            "natural_key": f"{admin_phone(event['admin_id'] - 1)}-{event['title'].lower()}",
+        })
+        members.extend({**m, "event_id": event_id} for m in make_members(event_id))
+        event_ids.append(event_id)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Admin), [{"id": i + 1, "phone": admin_phone(i)} for i in range(n_admins)])
+        conn.execute(insert(Event), events)
+        if members:
+            conn.execute(insert(Member), members)
+    return event_ids
@@ -0,0 +1,131 @@
+import cProfile
+import heapq
+import io
+import itertools
+import marshal
+import os
+import pstats
+import random
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import List, Optional
+
+from starlette.middleware.base import BaseHTTPMiddleware
+
+PROFILE_HEADER = "X-Debug-Profile"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))
+PROFILE_PATHS = tuple(p for p in os.getenv("PROFILE_PATHS", "/webhook").split(",") if p)
+
+# Fields handlers attach to the profile of the request they run in (see annotate())
+_current_profile: ContextVar[Optional[dict]] = ContextVar("current_profile", default=None)
+
+
+def annotate(**fields) -> None:
+    """Attach fields (e.g. session state, handler name) to the current request's profile, if any."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.update(fields)
+
+
+class ProfileStore:
+    """Keeps the `keep` slowest captured profiles (min-heap on duration)."""
+
+    def __init__(self, keep: int = 20):
+        self.keep = keep
+        self._heap: List[tuple] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, duration_ms: float, info: dict, profiler: cProfile.Profile) -> None:
+        profiler.create_stats()
+        entry = {**info, "id": next(self._ids), "duration_ms": round(duration_ms, 2), "stats": marshal.dumps(profiler.stats)}
+        with self._lock:
+            item = (duration_ms, entry["id"], entry)
+            if len(self._heap) < self.keep:
+                heapq.heappush(self._heap, item)
+            elif duration_ms > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+
+    def summaries(self) -> List[dict]:
+        with self._lock:
+            entries = [entry for _, _, entry in self._heap]
+        return [
+            {k: v for k, v in entry.items() if k != "stats"}
+            for entry in sorted(entries, key=lambda e: e["duration_ms"], reverse=True)
+        ]
+
+    def get(self, profile_id: int) -> Optional[dict]:
+        with self._lock:
+            return next((entry for _, _, entry in self._heap if entry["id"] == profile_id), None)
+
+    @staticmethod
+    def render_text(entry: dict, limit: int = 40) -> str:
+        """Human-readable report: request info plus the top functions by cumulative time."""
+        profiler = cProfile.Profile()
+        profiler.stats = marshal.loads(entry["stats"])
+        out = io.StringIO()
+        for key, value in entry.items():
+            if key != "stats":
+                out.write(f"{key}: {value}\n")
+        out.write("\n")
+        # pstats.Stats accepts any object exposing create_stats()/stats
+        profiler.create_stats = lambda: None
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+
+profile_store = ProfileStore(keep=PROFILE_KEEP)
+
+# cProfile can only have one active profiler per process on 3.12+, so profiles never overlap
+_profiling_lock = threading.Lock()
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """Profiles a sample of requests (PROFILE_SAMPLE_RATE) or those sending X-Debug-Profile: <PROFILE_TOKEN>.
+
+    The profile covers everything running on the event-loop thread while the
+    request is handled, which for the webhook is the whole sync handler chain.
+    Only installed when PROFILE_TOKEN is set (see profiling_enabled()).
+    """
+
+    async def dispatch(self, request, call_next):
+        if not self._should_profile(request) or not _profiling_lock.acquire(blocking=False):
+            return await call_next(request)
+
+        info = {
+            "path": request.url.path,
+            "method": request.method,
+            "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        }
+        token = _current_profile.set(info)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                response = await call_next(request)
+            finally:
+                profiler.disable()
+            info["status_code"] = response.status_code
+            return response
+        finally:
+            _current_profile.reset(token)
+            _profiling_lock.release()
+            profile_store.add((time.perf_counter() - start) * 1000, info, profiler)
+
+    @staticmethod
+    def _should_profile(request) -> bool:
+        if not request.url.path.startswith(PROFILE_PATHS):
+            return False
+        if PROFILE_TOKEN and request.headers.get(PROFILE_HEADER) == PROFILE_TOKEN:
+            return True
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def profiling_enabled() -> bool:
+    """Profiling needs PROFILE_TOKEN: without it the admin endpoints can't serve what was captured."""
+    return bool(PROFILE_TOKEN)
@@ -0,0 +1,41 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class StartupTimer:
+    """Collects cold-start timings: per-module import time and time to first ready."""
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self.imports: Dict[str, float] = {}
+        self.ready_seconds: Optional[float] = None
+
+    @contextmanager
+    def measure_import(self, name: str):
+        """Time the import block for `name`.
+
+        The time includes every module first loaded inside the block, so time
+        shared dependencies in their own blocks before the modules using them.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.imports[name] = time.perf_counter() - start
+
+    def mark_ready(self) -> None:
+        """Record time from the first app import to the end of the startup hook."""
+        if self.ready_seconds is None:
+            self.ready_seconds = time.perf_counter() - self._t0
+
+    def report(self) -> dict:
+        return {
+            "imports_ms": {name: round(sec * 1000, 2) for name, sec in self.imports.items()},
+            "total_import_ms": round(sum(self.imports.values()) * 1000, 2),
+            "time_to_ready_ms": round(self.ready_seconds * 1000, 2) if self.ready_seconds is not None else None,
+        }
+
+
+# Created when main.py is first imported so it measures the whole cold start
+startup_timer = StartupTimer()